@@ -0,0 +1,184 @@
+# Standard Python Modules
+import time
+
+# External Python Modules
+import pygame
+
+# Personal Python Modules
+from const import *
+from controls import KeyboardControls, MOVE_LEFT, MOVE_RIGHT, MOVE_UP, MOVE_DOWN
+from gamecore import GameCore, PlayerState
+from utils.coloredlog import ColorLogger
+
+# Moves tried by the autopilot at each step: (MOVE_* bits, x direction, y direction)
+MOVES = [(0, 0, 0)] + [(horizontal | vertical, dx + vx, dy + vy)
+                       for horizontal, dx, dy in ((0, 0, 0), (MOVE_LEFT, -1, 0), (MOVE_RIGHT, 1, 0))
+                       for vertical, vx, vy in ((0, 0, 0), (MOVE_UP, 0, -1), (MOVE_DOWN, 0, 1))
+                       if horizontal or vertical]
+
+
+class Autopilot(KeyboardControls):
+    """A bot playing through the same inputs as a human: it catches the monsters of the target type, avoids the others
+    & warps back to the safe zone when it can't avoid them anymore.
+
+    At each step, every move is simulated a few steps ahead (horizon) against the monsters around the player, moving
+    straight & bouncing off the edges: the move with the latest collision with a wrong monster, then the closest to the
+    target, is chosen.
+    Inputs of the window are still read, so the game can be paused or quit.
+    """
+
+    def __init__(self, horizon: int = 10, margin: int = 6, logger: ColorLogger = None):
+        """horizon: number of steps simulated ahead, margin: distance in pixels kept from wrong monsters"""
+        self.horizon = horizon
+        self.margin = margin
+        self.logger = logger
+        self.game = None
+        self.warp_wanted = False
+        self.round_number = 0
+        self.round_start = time.perf_counter()
+        self.games = 1
+        self.games_over = 0
+
+    def bind(self, game):
+        self.game = game
+        self.games_over = game.core.games_over
+
+    def _monster_states(self, core: GameCore) -> list:
+        """Return (monster, x, y, width, height, speed x, speed y) of the live monsters, after the last step"""
+        kinematics = core.monster_kinematics
+        if kinematics is not None:
+            # Monster rects are only updated before drawing
+            return list(zip(kinematics.monsters, kinematics.x.tolist(), kinematics.y.tolist(), kinematics.width.tolist(),
+                            kinematics.height.tolist(), (kinematics.dx * kinematics.velocity).tolist(),
+                            (kinematics.dy * kinematics.velocity).tolist()))
+        return [(monster, monster.rect.x, monster.rect.y, monster.rect.width, monster.rect.height,
+                 monster.dx * monster.velocity, monster.dy * monster.velocity) for monster in core.monsters]
+
+    def _player_path(self, player: PlayerState, dx: int, dy: int) -> list:
+        """Return the player top-left positions of the next steps when always moving in direction (dx, dy), as PlayerState.move"""
+        x, y = player.rect.topleft
+        zone = player.play_zone
+        velocity = player.velocity
+        width, height = player.rect.size
+        path = []
+        for step in range(self.horizon):
+            if dx < 0 and x >= zone.left + velocity:
+                x -= velocity
+            if dx > 0 and x + width <= zone.width - velocity:
+                x += velocity
+            if dy < 0 and y >= zone.top + velocity:
+                y -= velocity
+            if dy > 0 and y + height <= zone.bottom - velocity:
+                y += velocity
+            path.append((x, y))
+        return path
+
+    def _monster_path(self, zone: pygame.Rect, x: int, y: int, width: int, height: int, speed_x: int, speed_y: int) -> list:
+        """Return the monster top-left positions of the next steps, bouncing off the edges of zone as MonsterState.update"""
+        path = []
+        for step in range(self.horizon):
+            x += speed_x
+            y += speed_y
+            if x <= zone.left or x + width >= zone.right:
+                speed_x = -speed_x
+            if y <= zone.top or y + height >= zone.bottom:
+                speed_y = -speed_y
+            path.append((x, y))
+        return path
+
+    def _collisions(self, path: list, size: tuple, threats: list) -> tuple:
+        """Return the steps of the first collision with a wrong monster & of the first approach closer than margin
+        along path (player of size), horizon when none"""
+        width, height = size
+        margin = self.margin
+        hit = near = self.horizon
+        for monster_path, monster_width, monster_height in threats:
+            for step in range(hit):
+                player_x, player_y = path[step]
+                monster_x, monster_y = monster_path[step]
+                if (player_x < monster_x + monster_width + margin and monster_x < player_x + width + margin and
+                        player_y < monster_y + monster_height + margin and monster_y < player_y + height + margin):
+                    near = min(near, step)
+                    if (player_x < monster_x + monster_width and monster_x < player_x + width and
+                            player_y < monster_y + monster_height and monster_y < player_y + height):
+                        hit = step
+                        break
+        return hit, near
+
+    def moves(self) -> int:
+        return self.plan(self.game.core) if self.game is not None else 0
+
+    def plan(self, core: GameCore) -> int:
+        """Return the move (MOVE_* bits) to play in the next step of core, set warp_wanted when a warp is needed after it"""
+        self.warp_wanted = False
+        if core.target_monster is None:
+            return 0
+        player = core.player.rect
+        target_name = core.target_monster.name
+        reach = self.horizon * (core.player.velocity + 5) + self.margin     # 5: fastest monster velocity
+        monsters = self._monster_states(core)
+        targets = [state for state in monsters if state[0].name == target_name]
+        if not targets:
+            return 0
+        threats = [(self._monster_path(core.play_zone, x, y, width, height, speed_x, speed_y), width, height)
+                   for monster, x, y, width, height, speed_x, speed_y in monsters
+                   if monster.name != target_name and x <= player.right + reach and x + width >= player.left - reach
+                   and y <= player.bottom + reach and y + height >= player.top - reach]
+
+        # Aim where the closest target will be in a few steps
+        center_x, center_y = player.center
+        goal = min(targets, key=lambda state: (state[1] + state[3] / 2 - center_x) ** 2 + (state[2] + state[4] / 2 - center_y) ** 2)
+        goal_x = goal[1] + goal[3] / 2 + goal[5] * self.horizon / 2 - player.width / 2
+        goal_y = goal[2] + goal[4] / 2 + goal[6] * self.horizon / 2 - player.height / 2
+
+        best, best_cost = 0, None
+        for bits, dx, dy in MOVES:
+            path = self._player_path(core.player, dx, dy)
+            hit, near = self._collisions(path, player.size, threats)
+            end_x, end_y = path[-1]
+            cost = (-hit, -near, (end_x - goal_x) ** 2 + (end_y - goal_y) ** 2)
+            if best_cost is None or cost < best_cost:
+                best, best_cost = bits, cost
+
+        # Boxed in: every move hits a wrong monster after the next step (the warp happens before it)
+        self.warp_wanted = best_cost[0] > -2 and core.player.warps > 0 and player.top < core.safe_zone.top
+        return best
+
+    def events(self) -> list:
+        events = pygame.event.get()
+        game = self.game
+        if game is None:
+            return events
+        if game.is_paused:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN))
+        elif self.warp_wanted:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+            self.warp_wanted = False
+        self._log_progress()
+        return events
+
+    def wait(self, timeout: int) -> pygame.event.Event:
+        # Pause screens are left right away, unless the window is closed
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return event
+        return pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN)
+
+    def _log_progress(self):
+        core = self.game.core
+        round_number = core.scoreboard.round_number
+        # A game over is seen once the next game started (maybe in the same round number)
+        game_over = core.games_over != self.games_over
+        if round_number == self.round_number and not game_over:
+            return
+        now = time.perf_counter()
+        if game_over:
+            self.games += core.games_over - self.games_over
+            self.games_over = core.games_over
+            if self.logger:
+                self.logger.info(f"Autopilot: game over in round {self.round_number}, game {self.games} starts")
+        elif self.logger and self.round_number:
+            self.logger.info(f"Autopilot: round {self.round_number} completed in {now - self.round_start:.1f} s "
+                             f"({core.player.lives} lives, {core.player.warps} warps left)")
+        self.round_number = round_number
+        self.round_start = now
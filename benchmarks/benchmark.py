@@ -0,0 +1,172 @@
+'''
+Frame-time benchmarks of the game hot loop, run headless with fixed seeds.
+
+Usage (from any directory):
+    python benchmarks/benchmark.py                                  # run all scenarios, print JSON report
+    python benchmarks/benchmark.py --output bench.json              # save the report
+    python benchmarks/benchmark.py --save-baseline                  # store the report as baseline
+    python benchmarks/benchmark.py --baseline --threshold 10        # fail when a metric regresses by more than 10%
+
+Each scenario builds a Game, advances it to a round number (every round spawns round_number * number of ennemy types monsters)
+and measures:
+    - frame: Game.update (simulation + rendering)
+    - monster_update: Game.update_monsters (Monster.update for the whole monster group, or the NumPy engine)
+    - collisions: Game.check_collisions
+    - spawn: GameCore.prepare_round + GameCore.start_new_round (monsters taken from their pools & added to the board),
+      repeated after the measured frames (no pause screen nor rendering)
+    - draw calls: calls made to the screen surface per frame (reported, not compared to the baseline)
+    - peak_rss_kb: peak memory of the scenario (each scenario runs in its own process, whatever the scenarios order)
+'''
+### Import standard modules
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(CUR_DIR)
+BASELINE_FILE = os.path.join(CUR_DIR, "baseline.json")
+
+# Game assets are defined with paths relative to the game directory
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+# Keep stdout for the JSON report only
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+### Import personal modules
+from game import Game
+
+# Scenario name: round number to play (number of monsters = round number * number of ennemy types)
+SCENARIOS = {
+    "round_1": 1,
+    "round_20": 20,
+    "monsters_1000": 200,
+    "monsters_10000": 2000,
+}
+METRICS = ["frame", "monster_update", "collisions"]
+SPAWN_REPEATS = 20      # Spawns measured per scenario
+
+def percentiles(samples:list, cuts:tuple=(50, 95, 99)) -> dict:
+    """Return the percentiles cuts (in ms, default p50, p95 & p99) of a list of durations in seconds"""
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {f"p{cut}": quantiles[cut - 1] * 1000 for cut in cuts}
+
+def peak_rss_kb() -> int:
+    """Return the peak resident set size of the process in KB (None when not available on this platform)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+def run_scenario(round_number:int, frames:int, seed:int, settings_overrides:dict) -> dict:
+    """Play frames of round_number & return timings"""
+    game = Game(headless=True, settings_overrides={**settings_overrides, "Seed": seed})
+
+    # Move directly to the round before the measured one
+    game.core.scoreboard.round_number = round_number - 1
+    game.start_new_round()
+
+    samples = {metric: [] for metric in METRICS}
+    for i in range(frames):
+        start = time.perf_counter()
+        game.update()
+        samples["frame"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        game.update_monsters()
+        samples["monster_update"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        game.check_collisions()
+        samples["collisions"].append(time.perf_counter() - start)
+
+    result = {metric: percentiles(values) for metric, values in samples.items()}
+    result["monsters"] = len(game.monster_group)
+
+    # Spawn the measured round again, from the monsters given back to their pools
+    core = game.core
+    spawns = []
+    for i in range(SPAWN_REPEATS):
+        core.clear_monsters()
+        core.scoreboard.round_number = round_number - 1
+        start = time.perf_counter()
+        core.start_new_round(core.prepare_round(round_number))
+        spawns.append(time.perf_counter() - start)
+    result["spawn"] = percentiles(spawns, cuts=(50, 95))
+
+    result["draw_calls"] = statistics.fmean(frame["draw_calls"] for frame in game.profiler.frames)
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+def run_scenario_process(round_number:int, frames:int, seed:int, settings_overrides:dict) -> dict:
+    """Run a scenario in a new process, so its peak memory is its own"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(run_scenario, round_number, frames, seed, settings_overrides).result()
+
+def compare(report:dict, baseline:dict, threshold:float) -> list:
+    """Return the list of metrics regressing by more than threshold percent compared to baseline"""
+    regressions = []
+    for scenario, result in report["scenarios"].items():
+        reference = baseline.get("scenarios", {}).get(scenario)
+        if not reference:
+            continue
+        # Baselines saved before spawn percentiles have no "spawn" entry
+        values = [(f"{metric}.{cut}", result[metric][cut], reference.get(metric, {}).get(cut), "ms")
+                  for metric in METRICS + ["spawn"] for cut in result[metric]]
+        values.append(("peak_rss_kb", result["peak_rss_kb"], reference.get("peak_rss_kb"), "KB"))
+        for name, value, reference_value, unit in values:
+            if reference_value and value is not None and value > reference_value * (1 + threshold / 100):
+                digits = 3 if unit == "ms" else 0
+                regressions.append(f"{scenario} {name}: {value:.{digits}f} {unit} vs {reference_value:.{digits}f} {unit} baseline "
+                                   f"(+{(value / reference_value - 1) * 100:.1f}%)")
+    return regressions
+
+def get_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmarks")
+    parser.add_argument("--scenario", choices=SCENARIOS.keys(), action="append",
+                        help="scenario to run, can be repeated (default: all)")
+    parser.add_argument("--frames", type=int, default=300, help="number of frames measured per scenario (default: 300)")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed (default: 1234)")
+    parser.add_argument("--render-mode", choices=["full", "dirty"], default="full", help="render mode (default: full)")
+    parser.add_argument("--monster-engine", choices=["python", "numpy"], default="python", help="monster engine (default: python)")
+    parser.add_argument("--collision-mode", choices=["linear", "grid"], default="linear", help="collision mode (default: linear)")
+    parser.add_argument("--output", help="JSON file to write the report to")
+    parser.add_argument("--save-baseline", action="store_true", help=f"store the report as baseline ({BASELINE_FILE})")
+    parser.add_argument("--baseline", nargs="?", const=BASELINE_FILE, help="compare the report against a baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="regression threshold in percent when comparing with baseline (default: 10)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = get_arguments()
+    scenarios = args.scenario or list(SCENARIOS.keys())
+    settings_overrides = {"RenderMode": args.render_mode, "CollisionMode": args.collision_mode, "MonsterEngine": args.monster_engine}
+    report = {
+        "frames": args.frames,
+        "seed": args.seed,
+        "settings": settings_overrides,
+        "scenarios": {name: run_scenario_process(SCENARIOS[name], args.frames, args.seed, settings_overrides) for name in scenarios}
+    }
+
+    report_json = json.dumps(report, indent=4)
+    print(report_json)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(report_json)
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w") as baseline_file:
+            baseline_file.write(report_json)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.threshold)
+        for regression in regressions:
+            print("REGRESSION:", regression, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,206 @@
+'''
+Monte Carlo simulation of bot games, to tune difficulty (spawn rule) & round bonus on numbers instead of feel.
+
+Usage (from any directory):
+    python benchmarks/simulate.py                                       # 200 games with game.yaml settings, print JSON report
+    python benchmarks/simulate.py --games 2000 --output sim.json        # save the report
+    python benchmarks/simulate.py --set MonsterEngine=numpy             # override game.yaml fields (can be repeated)
+    python benchmarks/simulate.py --sweep SpawnPerRound=1,2,3           # compare several values of a game.yaml field
+
+Each game is played by the autopilot from round 1 until game over, MaxRounds or MaxMinutes of simulated time.
+Games are run on the game core only (no display, image or sound) on all CPU cores through a process pool.
+Game number i always uses seed + i whatever the settings & the worker running it: results are reproducible and
+every settings variant plays the same seeds.
+
+Report, per settings variant:
+    - score, last round & simulated minutes per game (mean & percentiles), reasons games ended
+    - per round number: games reaching it, completion rate, duration (simulated seconds), deaths per game & per
+      simulated minute, bonus
+'''
+### Import standard modules
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+CUR_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(CUR_DIR)
+
+# Settings files are defined with paths relative to the game directory
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+# Keep stdout for the JSON report only
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+### Import external modules
+import yaml
+
+### Import personal modules
+from autopilot import Autopilot
+from gamecore import GameCore, DIED, ROUND_COMPLETED, GAME_OVER
+from gamesettings import GameSettings, SettingsError, load_settings
+
+# Core of the worker process, built again only when the settings change
+_core: GameCore = None
+_core_overrides: dict = None
+
+def get_core(settings_overrides:dict) -> GameCore:
+    global _core, _core_overrides
+    if _core is None or settings_overrides != _core_overrides:
+        _core = GameCore.from_settings_files(random.Random(), settings_overrides=settings_overrides)
+        _core_overrides = settings_overrides
+    return _core
+
+def play_game(job:tuple) -> dict:
+    """Play one bot game (job: seed, settings overrides, max rounds, max simulated minutes), return its statistics"""
+    seed, settings_overrides, max_rounds, max_minutes = job
+    core = get_core(settings_overrides)
+
+    # Same seed, same game: the random generator is shared by the core, its monster pools & monsters
+    core.rng.seed(seed)
+    pilot = Autopilot()
+    core.reset()
+    core.start_new_round()
+
+    scoreboard = core.scoreboard
+    max_steps = int(max_minutes * 60 / core.tick_time)
+    rounds = []
+    deaths = 0
+    end = "max_minutes"
+    step = 0
+    while step < max_steps:
+        outcome = core.step(pilot.plan(core))
+        step += 1
+        if outcome == GAME_OVER:
+            rounds.append({"round": scoreboard.round_number, "completed": False, "time": scoreboard.round_clock,
+                           "deaths": deaths + 1})
+            end = "game_over"
+            break
+        if outcome == DIED:
+            deaths += 1
+        elif outcome == ROUND_COMPLETED:
+            round_number, round_clock = scoreboard.round_number, scoreboard.round_clock
+            core.start_new_round()
+            rounds.append({"round": round_number, "completed": True, "time": round_clock, "deaths": deaths,
+                           "bonus": scoreboard.bonus})
+            deaths = 0
+            if round_number >= max_rounds:
+                end = "max_rounds"
+                break
+        elif pilot.warp_wanted:
+            core.warp()
+    else:
+        rounds.append({"round": scoreboard.round_number, "completed": False, "time": scoreboard.round_clock, "deaths": deaths})
+    return {"seed": seed, "end": end, "score": scoreboard.score, "last_round": rounds[-1]["round"],
+            "minutes": step * core.tick_time / 60, "rounds": rounds}
+
+def distribution(values:list) -> dict:
+    """Return mean, p5, p50 & p95 of a list of numbers"""
+    if len(values) < 2:
+        value = values[0] if values else 0
+        return {"mean": value, "p5": value, "p50": value, "p95": value}
+    cuts = statistics.quantiles(values, n=20, method="inclusive")
+    return {"mean": statistics.fmean(values), "p5": cuts[0], "p50": statistics.median(values), "p95": cuts[18]}
+
+def aggregate(games:list) -> dict:
+    """Return the statistics of a settings variant from the results of its games"""
+    ends = {}
+    for game in games:
+        ends[game["end"]] = ends.get(game["end"], 0) + 1
+    by_round = {}
+    for game in games:
+        for played in game["rounds"]:
+            by_round.setdefault(played["round"], []).append(played)
+    rounds = {}
+    for round_number, played in sorted(by_round.items()):
+        completed = [item for item in played if item["completed"]]
+        minutes = sum(item["time"] for item in played) / 60
+        deaths = sum(item["deaths"] for item in played)
+        rounds[round_number] = {
+            "games": len(played),
+            "completion_rate": len(completed) / len(played),
+            "time_s": distribution([item["time"] for item in completed]),
+            "deaths_per_game": deaths / len(played),
+            "deaths_per_minute": deaths / minutes if minutes else 0,
+            "bonus": distribution([item["bonus"] for item in completed]),
+        }
+    return {
+        "games": len(games),
+        "ends": ends,
+        "score": distribution([game["score"] for game in games]),
+        "last_round": distribution([game["last_round"] for game in games]),
+        "minutes": distribution([game["minutes"] for game in games]),
+        "rounds": rounds,
+    }
+
+def parse_override(text:str) -> tuple:
+    """Return (field, value) of a FIELD=VALUE argument, value written as in game.yaml"""
+    field, separator, value = text.partition("=")
+    if not separator or not field:
+        raise argparse.ArgumentTypeError(f"FIELD=VALUE expected, got '{text}'")
+    return field, yaml.safe_load(value)
+
+def parse_sweep(text:str) -> tuple:
+    """Return (field, values) of a FIELD=VALUE1,VALUE2,... argument"""
+    field, separator, values = text.partition("=")
+    if not separator or not field:
+        raise argparse.ArgumentTypeError(f"FIELD=VALUE1,VALUE2,... expected, got '{text}'")
+    return field, [yaml.safe_load(value) for value in values.split(",")]
+
+def get_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of autopilot games for difficulty tuning")
+    parser.add_argument("--games", type=int, default=200, help="number of games per settings variant (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game, game i uses seed + i (default: 0)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes (default: CPU count)")
+    parser.add_argument("--max-rounds", type=int, default=30, help="stop a game after this round (default: 30)")
+    parser.add_argument("--max-minutes", type=float, default=30.0,
+                        help="stop a game after this simulated time in minutes (default: 30)")
+    parser.add_argument("--set", type=parse_override, action="append", default=[], metavar="FIELD=VALUE",
+                        help="override a top level game.yaml field, can be repeated")
+    parser.add_argument("--sweep", type=parse_sweep, metavar="FIELD=VALUE1,VALUE2,...",
+                        help="run every game once per value of a top level game.yaml field")
+    parser.add_argument("--output", help="JSON file to write the report to")
+    args = parser.parse_args()
+    # Unknown fields or invalid values are reported before any game is played
+    for field, value in args.set + ([(args.sweep[0], value) for value in args.sweep[1]] if args.sweep else []):
+        try:
+            load_settings(GameSettings, "game.yaml", overrides={field: value}, exit_on_error=False)
+        except SettingsError as e:
+            parser.error(str(e))
+    return args
+
+if __name__ == "__main__":
+    args = get_arguments()
+    settings_overrides = dict(args.set)
+    variants = {"settings": settings_overrides}
+    if args.sweep:
+        field, values = args.sweep
+        variants = {f"{field}={value}": {**settings_overrides, field: value} for value in values}
+
+    # Jobs of a variant are contiguous: workers only build a new core when the variant changes
+    jobs = [(args.seed + i, overrides, args.max_rounds, args.max_minutes) for overrides in variants.values() for i in range(args.games)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        results = list(executor.map(play_game, jobs, chunksize=max(1, len(jobs) // (args.workers * 8))))
+
+    report = {
+        "games": args.games,
+        "seed": args.seed,
+        "max_rounds": args.max_rounds,
+        "max_minutes": args.max_minutes,
+        "workers": args.workers,
+        "wall_time_s": time.perf_counter() - start,
+        "variants": {name: {"settings": overrides, **aggregate(results[i*args.games:(i+1)*args.games])}
+                     for i, (name, overrides) in enumerate(variants.items())},
+    }
+
+    report_json = json.dumps(report, indent=4)
+    print(report_json)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(report_json)
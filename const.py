@@ -3,8 +3,15 @@ import logging
 import os
 from utils.console import Console
 from utils.coloredlog import LOGLEVEL_SUCCESS, LOGLEVEL_DISABLE
+from utils.assetcache import AssetCache
+from utils.textcache import TextCache
 CONSOLE = Console(colored=True)
 
+# Shared cache for images & sounds (each file is decoded once per process)
+ASSETS = AssetCache()
+# Shared cache for rendered texts (a text is only rasterised again when its value changes)
+TEXTS = TextCache()
+
 # Some generic paths
 CUR_DIR = os.path.dirname(os.path.abspath(__file__))
 LOG_DIR = os.path.join(CUR_DIR,"logs")
@@ -26,6 +33,9 @@ LOGLEVEL_CONSOLE = logging.WARNING
 LOGLEVEL_FILE = logging.DEBUG
 LOGLEVEL_FILE = LOGLEVEL_DISABLE
 LOG_FILE = "DYNAMIC"     #Sample: os.path.join(LOG_DIR,"logfile.log")  or "DYNAMIC" to have it generated with timestamp
+LOG_QUEUE = True         # True: records are written by a background thread, the game loop never waits for the disk or the terminal
+LOG_MAX_BYTES = 5*1024*1024  # Log file is rotated when it reaches this size (0: never rotated)
+LOG_BACKUP_COUNT = 3     # Number of rotated log files kept
 
 if __name__ == "__main__":  
     CONSOLE.clear_screen()
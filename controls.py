@@ -0,0 +1,210 @@
+# Standard Python Modules
+import gzip
+import struct
+
+# External Python Modules
+import pygame
+
+# Personal Python Modules
+from const import *
+from utils.coloredlog import ColorLogger
+
+# Directions held by the player, as bits of an int
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+MOVE_UP = 4
+MOVE_DOWN = 8
+
+# Replay file: gzip compressed header followed by one entry per input read by the game (1 byte tag + payload)
+REPLAY_MAGIC = b"MWRP"
+REPLAY_VERSION = 1
+REPLAY_HEADER = struct.Struct("<4sBQB")     # magic, version, seed, flags
+REPLAY_HEADLESS = 1                         # flags: game recorded in headless mode (pauses skipped)
+REPLAY_FIXED_LOOP = 2                       # flags: steps per frame given by the fixed timestep loop
+TAG_MOVES = b"M"                            # moves of one simulation step: B
+TAG_EVENTS = b"E"                           # events of one frame: B count, then count * EVENT
+TAG_WAIT = b"W"                             # event ending a wait on a static pause screen: EVENT
+TAG_TICKS = b"T"                            # simulation steps of one frame: B
+TAG_END = b"Z"                              # end of the recording: 16 bytes digest of the final game state
+EVENT = struct.Struct("<BI")                # event kind, key
+EVENT_KINDS = {pygame.QUIT: 1, pygame.KEYDOWN: 2, pygame.WINDOWEXPOSED: 3}     # Events the game reacts to
+EVENT_TYPES = {kind: event_type for event_type, kind in EVENT_KINDS.items()}
+
+
+class KeyboardControls():
+    """Player inputs read from the keyboard & the window
+
+    The game reads all its inputs through this interface: moves() once per simulation step, events() once per frame,
+    wait() on static pause screens & frame_ticks() for the number of steps of a frame (fixed timestep loop).
+    bind() is called with the game once it is ready, for controls needing to look at it (like the autopilot).
+    """
+
+    def bind(self, game):
+        pass
+
+    def moves(self) -> int:
+        """Return the directions held by the player (MOVE_* bits)"""
+        keys = pygame.key.get_pressed()
+        return ((MOVE_LEFT if keys[pygame.K_LEFT] else 0) | (MOVE_RIGHT if keys[pygame.K_RIGHT] else 0) |
+                (MOVE_UP if keys[pygame.K_UP] else 0) | (MOVE_DOWN if keys[pygame.K_DOWN] else 0))
+
+    def events(self) -> list:
+        """Return the events received since the previous frame"""
+        return pygame.event.get()
+
+    def wait(self, timeout: int) -> pygame.event.Event:
+        """Sleep until an event is received (NOEVENT after timeout ms)"""
+        return pygame.event.wait(timeout)
+
+    def frame_ticks(self, ticks: int) -> int:
+        """Return the number of simulation steps to run for this frame (ticks: steps needed to follow real time)"""
+        return ticks
+
+    def close(self):
+        pass
+
+
+class InputRecorder():
+    """Pass the inputs of controls to the game & save them in a replay file"""
+
+    def __init__(self, filename: str, controls, seed: int, flags: int, logger: ColorLogger = None):
+        self.filename = filename
+        self.controls = controls
+        self.logger = logger
+        self.file = gzip.open(filename, "wb")
+        self.file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, seed, flags))
+        self.entries = 0
+        self.game = None
+
+    def bind(self, game):
+        self.game = game
+        self.controls.bind(game)
+
+    def moves(self) -> int:
+        moves = self.controls.moves()
+        self.file.write(TAG_MOVES + bytes((moves,)))
+        self.entries += 1
+        return moves
+
+    def events(self) -> list:
+        events = [event for event in self.controls.events() if event.type in EVENT_KINDS]
+        self.file.write(TAG_EVENTS + bytes((len(events),)) +
+                        b"".join(EVENT.pack(EVENT_KINDS[event.type], getattr(event, "key", 0)) for event in events))
+        self.entries += 1
+        return events
+
+    def wait(self, timeout: int) -> pygame.event.Event:
+        event = self.controls.wait(timeout)
+        if event.type in EVENT_KINDS:
+            # Waits ended by a timeout or an ignored event change nothing: they are not saved
+            self.file.write(TAG_WAIT + EVENT.pack(EVENT_KINDS[event.type], getattr(event, "key", 0)))
+            self.entries += 1
+        return event
+
+    def frame_ticks(self, ticks: int) -> int:
+        ticks = min(self.controls.frame_ticks(ticks), 255)
+        self.file.write(TAG_TICKS + bytes((ticks,)))
+        self.entries += 1
+        return ticks
+
+    def close(self):
+        self.controls.close()
+        if not self.file.closed:
+            if self.game is not None:
+                # Lets the replay check it reproduced the game exactly
+                self.file.write(TAG_END + self.game.core.state_digest())
+            self.file.close()
+            if self.logger:
+                self.logger.info(f"{self.entries} inputs recorded in '{self.filename}'")
+
+
+class InputReplayer():
+    """Feed the game with the inputs of a replay file (the game stops at the end of the file)
+
+    The game stops right after the last recorded frame, then its state is checked against the digest saved at the end
+    of the recording: a mismatch is logged as an error.
+    """
+
+    def __init__(self, filename: str, logger: ColorLogger = None):
+        self.filename = filename
+        self.logger = logger
+        self.file = gzip.open(filename, "rb")
+        magic, version, self.seed, self.flags = REPLAY_HEADER.unpack(self.file.read(REPLAY_HEADER.size))
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"'{filename}' is not a replay file (version {REPLAY_VERSION})")
+        self.headless = bool(self.flags & REPLAY_HEADLESS)
+        self.fixed_loop = bool(self.flags & REPLAY_FIXED_LOOP)
+        self.finished = False
+        self.entries = 0
+        self.game = None
+        self.end_digest: bytes = None
+
+    def bind(self, game):
+        self.game = game
+
+    def _next(self, tag: bytes) -> bool:
+        """Read the tag of the next entry, return False (& stop the replay) at the end of the file or on a different tag"""
+        if self.finished:
+            return False
+        if self._at_end():
+            return False
+        next_tag = self.file.read(1)
+        if next_tag != tag:
+            self.finished = True
+            if self.logger:
+                self.logger.error(f"Replay '{self.filename}' out of sync after {self.entries} inputs "
+                                  f"(expected {tag}, found {next_tag}): game or settings differ from the recording")
+            return False
+        self.entries += 1
+        return True
+
+    def _at_end(self) -> bool:
+        """Return True (& stop the replay, reading the final state digest) when the recording ends here"""
+        next_tag = self.file.peek(1)[:1]
+        if next_tag not in (TAG_END, b""):
+            return False
+        self.finished = True
+        if next_tag == TAG_END:
+            self.file.read(1)
+            self.end_digest = self.file.read(16)
+        if self.logger:
+            self.logger.info(f"End of replay '{self.filename}' ({self.entries} inputs)")
+        return True
+
+    def _read_event(self) -> pygame.event.Event:
+        kind, key = EVENT.unpack(self.file.read(EVENT.size))
+        return pygame.event.Event(EVENT_TYPES[kind], key=key)
+
+    def moves(self) -> int:
+        return self.file.read(1)[0] if self._next(TAG_MOVES) else 0
+
+    def events(self) -> list:
+        # Closing the window stops the replay
+        quit_events = [event for event in pygame.event.get() if event.type == pygame.QUIT]
+        if not self._next(TAG_EVENTS):
+            return [pygame.event.Event(pygame.QUIT)]
+        events = [self._read_event() for i in range(self.file.read(1)[0])]
+        # The recording stopped after these events: stop before the game runs one more step
+        if self._at_end():
+            quit_events.append(pygame.event.Event(pygame.QUIT))
+        return events + quit_events
+
+    def wait(self, timeout: int) -> pygame.event.Event:
+        pygame.event.pump()
+        if not self._next(TAG_WAIT):
+            return pygame.event.Event(pygame.QUIT)
+        event = self._read_event()
+        # The recording stopped on a pause screen (the event quits the game)
+        self._at_end()
+        return event
+
+    def frame_ticks(self, ticks: int) -> int:
+        return self.file.read(1)[0] if self._next(TAG_TICKS) else 0
+
+    def close(self):
+        self.file.close()
+        if self.end_digest is not None and self.game is not None and self.logger:
+            if self.game.core.state_digest() == self.end_digest:
+                self.logger.info(f"Replay '{self.filename}' reproduced the recorded game exactly")
+            else:
+                self.logger.error(f"Replay '{self.filename}' ended in a different state than the recorded game")
@@ -1,6 +1,9 @@
 # Standard Python Modules
+import logging
 import os
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 # External Python Modules
@@ -9,17 +12,22 @@ from pygame.math import Vector2 as vector   # to use 2D vectors
 
 # Personal Python Modules
 from const import *
+from controls import KeyboardControls, InputRecorder, InputReplayer, REPLAY_HEADLESS, REPLAY_FIXED_LOOP
 from dashboard import Dashboard
 from ennemies import Ennemies, Monster
+from gamecore import GameCore, MonsterState, CAUGHT, ROUND_COMPLETED, DIED, GAME_OVER, zones_layout
 from player import Player
 from safezone import SafeZone
-from utils.parameterfile import ParameterFile
+from gamesettings import GameSettings, PlayerSettings, ZoneSettings, EnemyType, SettingsError, load_settings
 from utils.coloredlog import ColorLogger
+from utils.frameprofiler import FrameProfiler
+from utils.renderqueue import RenderQueue
+from utils.settingswatcher import SettingsWatcher
 
 # TODO
 # - DONE: Load of background images
 # - Load image or animated sprites using parameters
-# - How to validate format of fields in YAMLL file --> use schema library
+# - DONE: How to validate format of fields in YAMLL file --> gamesettings records
 # - Add more logging for debugging purpose
 # - Add a first page before starting (other then the pause one use currently)
 # - Add possibility to safe name & display TOP 10 scores
@@ -29,282 +37,652 @@ from utils.coloredlog import ColorLogger
 #       - limited time to catch all monsters
 #       - extra bonus/malus
 
+# Layers of the render queue, drawn from the lowest
+LAYER_BACKGROUND = 0    # Static layer (whole screen, or the areas to erase in dirty mode)
+LAYER_PLAYER = 1
+LAYER_MONSTERS = 2
+LAYER_HUD = 3           # Dashboard texts & play zone border
+LAYER_MESSAGES = 4      # Pause texts & profiler overlay
 
 class Game():
-    """A class to control gameplay"""
-
-    def __init__(self, logger: ColorLogger = None):
-        """Initilize the game object"""
+    """A class to control gameplay: inputs, pause screens, sounds & rendering of the game core (state & rules)"""
+
+    def __init__(self, logger: ColorLogger = None, headless: bool = None, settings_overrides: dict = None,
+                 controls=None, record_file: str = None, replay_file: str = None):
+        """Initilize the game object
+
+        Args:
+            logger (ColorLogger, optional): Defaults to None.
+            headless (bool, optional): Run without window nor sound card, as fast as possible. Defaults to None (use game.yaml value).
+            settings_overrides (dict, optional): Top level game.yaml fields to override. Defaults to None.
+            controls (optional): Player inputs (see KeyboardControls). Defaults to None (keyboard).
+            record_file (str, optional): Save the seed & the inputs of the game in this replay file. Defaults to None.
+            replay_file (str, optional): Play again the game saved in this replay file. Defaults to None.
+        """
         self.logger = logger
+        ASSETS.logger = logger
 
         # load game settings
-        self.param_file = os.path.join(SETTINGS, "game.yaml")
-        self.settings = ParameterFile(self.param_file, logger).parameters
-        if not self.settings:
-            exit()
-        else:
+        self.settings_overrides = settings_overrides
+        self.settings: GameSettings = load_settings(GameSettings, "game.yaml", logger, overrides=settings_overrides)
+        self._init_var_from_settings()
+        if headless is not None:
+            self.headless = headless
+
+        # A game is reproduced from its seed & its inputs: every random draw uses self.rng, every input self.controls
+        self.controls = controls if controls is not None else KeyboardControls()
+        self.seed = self.settings.seed
+        self.fixed_loop = self.fixed_timestep and not self.headless
+        self.auto_continue = self.headless      # Nobody can press 'Enter' in headless mode: pause screens are skipped
+        if replay_file:
+            self.controls = InputReplayer(replay_file, logger=self.logger)
+            self.seed = self.controls.seed
+            self.fixed_loop = self.controls.fixed_loop
+            self.auto_continue = self.controls.headless
+        if self.seed is None:
+            self.seed = random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        if record_file:
+            flags = (REPLAY_HEADLESS if self.auto_continue else 0) | (REPLAY_FIXED_LOOP if self.fixed_loop else 0)
+            self.controls = InputRecorder(record_file, self.controls, self.seed, flags, logger=self.logger)
+        if self.logger:
+            self.logger.info(f"Game seed: {self.seed}")
+
+        # Settings changes could not be replayed
+        self.settings_watcher: SettingsWatcher = None
+        if self.settings.settings_reload and not (record_file or replay_file):
+            self.settings_watcher = SettingsWatcher(SETTINGS, interval=self.settings.settings_poll, logger=self.logger)
+
+        # Set game values
+        self.exit = False
+        self.is_paused = False
+        self.loop_restarts = 0      # Number of times the fixed timestep accumulator was restarted
+        self.clock = pygame.time.Clock()
+
+        # Initialize Screen
+        # pygame.mixer.pre_init(44100, -16, 2, 4096)    # Not sure about usage
+        if self.headless:
+            # SDL dummy drivers must be selected before pygame is initialized
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
             if self.logger:
-                self.logger.info(f"Game settings: {self.settings}")
-
-            self._init_var_from_settings()
-
-            # Set game values
-            self.exit = False
-            self.is_paused = False
-            self.clock = pygame.time.Clock()
-
-            # Initialize Screen
-            # pygame.mixer.pre_init(44100, -16, 2, 4096)    # Not sure about usage
-            pygame.init()
-            pygame.display.set_caption(self.title)
-            if self.icon_path:
-                self.icon = pygame.image.load(self.icon_path)
-                pygame.display.set_icon(self.icon)
-
-            # Set screen Regions
-            self.screen = pygame.display.set_mode(self.screen_size)
-            self.screen_rect = self.screen.get_rect()
-            self.dashboard = Dashboard(
-                screen=self.screen, logger=self.logger)  # TOP of screen
-            self.safezone = SafeZone(
-                screen=self.screen, logger=self.logger)  # BOTTOM of screen
-            self.playzone = pygame.Rect(0, self.dashboard.zone_height+1, self.screen_size.x, self.screen_size.y -
-                                        self.dashboard.zone_height - self.safezone.zone_height)   # Middle of Screen
-
-            # Set background images
-            if self.background_image_path:
-                self.background_image = pygame.transform.scale(
-                    pygame.image.load(self.background_image_path), self.playzone.size)
-                self.background_rect = self.background_image.get_rect()
-                self.background_rect.topleft = self.playzone.topleft
-
-            # Set sounds and music
-            self.next_level_sound = pygame.mixer.Sound(
-                file=self.sound_path_next_level)
-
-            # Set font
-            self.font = pygame.font.Font(self.font_path, size=self.font_size)
-
-            # Create all sprite groups
-            self.player_group = pygame.sprite.Group()
-            self.monster_group = pygame.sprite.Group()
-
-            # Initialize Player
-            self.player = Player(
-                play_zone=self.playzone, safe_zone=self.safezone.screen_rect, logger=self.logger)
-            self.player_group.add(self.player)
-
-            # Initialize Monsters
-            self.ennemies_lst = Ennemies(logger=self.logger).ennemies_lst
-            self.target_monster: Monster = None
+                self.logger.info("Headless mode: SDL dummy video & audio drivers selected")
+        pygame.init()
+        pygame.display.set_caption(self.title)
+        if self.settings.icon:
+            self.icon = ASSETS.get_image(self.settings.icon)
+            pygame.display.set_icon(self.icon)
+
+        # Set screen Regions
+        self.screen = pygame.display.set_mode(self.screen_size)
+        self.screen_rect = self.screen.get_rect()
+        self.dashboard = Dashboard(
+            screen=self.screen, logger=self.logger)  # TOP of screen
+        self.safezone = SafeZone(
+            screen=self.screen, logger=self.logger)  # BOTTOM of screen
+        self.playzone = zones_layout(self.screen.get_size(), self.dashboard.zone_height, self.safezone.zone_height)[1]   # Middle of Screen
+
+        # Set sounds and music
+        self.next_level_sound = ASSETS.get_sound(self.settings.sound_next_level)
+
+        # Set font
+        self.font = pygame.font.Font(self.settings.font.path, size=self.font_size)
+
+        # Create all sprite groups
+        self.player_group = pygame.sprite.Group()
+        self.monster_group = pygame.sprite.Group()
+
+        # Initialize the game core: player, monsters, score & rules (the zones rects are shared with it)
+        self.core = GameCore(settings=self.settings, player_settings=load_settings(PlayerSettings, "player.yaml", self.logger),
+                             ennemies_lst=Ennemies(logger=self.logger).ennemies_lst, play_zone=self.playzone,
+                             safe_zone=self.safezone.screen_rect, rng=self.rng, logger=self.logger)
+        self.monster_engine = self.core.monster_engine
+        self.collision_mode = self.core.collision_mode
+
+        # Initialize the sprites drawing the core
+        self.player = Player(self.core.player, logger=self.logger)
+        self.player_group.add(self.player)
+        self.monster_sprites: dict[MonsterState, Monster] = {}
+        self._load_monster_assets()
+        # Next round monsters are prepared on a worker thread during the 'level completed' pause
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self.previous_positions = {}
+
+        # Time spent per frame phase, shown with F3
+        self.profiler = FrameProfiler(max_frames=self.profiler_frames)
+        self.profiler_font = pygame.font.Font(None, 20)
+        self.profiler_overlay: pygame.Surface = None
+        self.profiler_overlay_age = 0
+        self.show_profiler = False
+
+        # Prepare rendering: all the blits of a frame are submitted at once
+        self.render_queue = RenderQueue()
+        self.drawn_rects = []                   # Where sprites were drawn in the last frame, erased by the next dirty frame
+        self.border_key = None
+        self.border_items = []
+        self.full_redraw = True
+        self._build_static_layer()
+
+        self.controls.bind(self)
+
+        if self.logger:
+            assets_stats = ASSETS.stats()
+            self.logger.info(f"{assets_stats['converted']} surfaces converted to display format "
+                             f"({assets_stats['converted_bytes']} bytes)")
 
     def _init_var_from_settings(self):
-        try:
-            self.title = self.settings["Title"]
-            self.icon_path = self.settings["Icon"]
-            self.FPS = self.settings["FPS"]
-            self.screen_size = vector(self.settings["ScreenSize"])
-
-            self.font_path: str = self.settings["Font"]["Path"]
-            self.font_size: int = self.settings["Font"]["Size"]
-            self.font_color: tuple = self.settings["Font"]["Color"]
-            self.background_color: tuple = self.settings["Background"]["Color"]
-            self.background_image_path: str = self.settings["Background"]["Image"]
-
-            self.music_path_play: str = self.settings["Music"]["Play"]
-            self.music_path_pause: str = self.settings["Music"]["Pause"]
-
-            self.sound_path_next_level: str = self.settings["Sound"]["NextLevel"]
-        except Exception as e:
-            if self.logger:
-                self.logger.error(
-                    f"{str(e)} field not found in {self.param_file} !")
-                self.logger.error(f"EXIT PROGRAM !!!")
-            else:
-                print(
-                    "ERROR:", f"{str(e)} field not found in {self.param_file} !")
-                print("ERROR:", f"EXIT PROGRAM !!!")
-            exit()
+        """Initialize instance variables from settings (modes may be changed later on by the game)"""
+        self.title = self.settings.title
+        self.FPS = self.settings.fps
+        self.screen_size = vector(self.settings.screen_size)
+        self.render_mode = self.settings.render_mode
+        self.headless = self.settings.headless
+        self.collision_mode = self.settings.collision_mode
+        self.monster_engine = self.settings.monster_engine
+        self.fixed_timestep = self.settings.fixed_timestep
+        self.tick_rate = self.settings.tick_rate
+        self.tick_time: float = 1 / self.tick_rate
+        self.max_ticks_per_frame = self.settings.max_ticks_per_frame
+        self.interpolation = self.settings.interpolation
+        self.pause_fps = self.settings.pause_fps
+        self.pause_wait_timeout = self.settings.pause_wait_timeout
+        self.profiler_frames = self.settings.profiler_frames
+        self.profiler_dump = self.settings.profiler_dump
+
+        self.font_size = self.settings.font.size
+        self.font_color = self.settings.font.color
+        self.background_color = self.settings.background.color
+        self.background_image_path = self.settings.background.image
+
+    @property
+    def target_monster(self) -> Monster:
+        """Sprite of the target monster (None when there is no target)"""
+        target = self.core.target_monster
+        return self._monster_sprite(target) if target is not None else None
+
+    def _monster_sprite(self, monster: MonsterState) -> Monster:
+        """Return the sprite drawing monster (sprites are kept with the monsters, which are reused by their pool)"""
+        sprite = self.monster_sprites.get(monster)
+        if sprite is None:
+            sprite = self.monster_sprites[monster] = Monster(monster, logger=self.logger)
+        return sprite
+
+    def _sync_monster_sprites(self):
+        """Draw the live monsters of the core (after they were replaced)"""
+        self.monster_group.empty()
+        self.monster_group.add(*[self._monster_sprite(monster) for monster in self.core.monsters])
+
+    def _load_monster_assets(self):
+        """Load monster images & sounds now that display mode is set"""
+        for ennemy in self.core.ennemies_lst:
+            ASSETS.get_image(ennemy.image_path, ennemy.size, convert="alpha")
+            ASSETS.get_sound(ennemy.sound_collision)
 
     def update(self, msg1: pygame.Surface = None, msg2: pygame.Surface = None):
-        # Fill the display
+        """Run one simulation step (when not paused) & draw one frame"""
+        if not self.is_paused:
+            self.step()
+        self.render(msg1, msg2)
+
+    def step(self):
+        """Advance the simulation by one tick (GameCore.step), then play its outcome: sounds, pause screens & new round"""
+        if self.interpolation:
+            # Positions before the step, to draw sprites between 2 steps
+            self.previous_positions = {sprite: sprite.rect.topleft for sprite in self.player_group}
+            if self.core.monster_kinematics is None:
+                self.previous_positions.update({sprite: sprite.rect.topleft for sprite in self.monster_group})
+        outcome = self.core.step(self.controls.moves(), profiler=self.profiler)
+        self.play_outcome(outcome)
+        self.profiler.mark("collisions")     # Playing the outcome (sounds, next round) is part of the collisions zone
+
+    def _interpolate_positions(self, alpha: float) -> dict:
+        """Move sprites between their previous & current positions, return current positions to restore after drawing"""
+        current_positions = {}
+        for sprite, (previous_x, previous_y) in self.previous_positions.items():
+            x, y = sprite.rect.topleft
+            # Teleports (warp, new round) are not interpolated
+            if sprite.alive() and abs(x - previous_x) <= 32 and abs(y - previous_y) <= 32:
+                current_positions[sprite] = (x, y)
+                sprite.rect.topleft = (round(previous_x + (x - previous_x) * alpha), round(previous_y + (y - previous_y) * alpha))
+        return current_positions
+
+    def render(self, msg1: pygame.Surface = None, msg2: pygame.Surface = None, alpha: float = None):
+        """Draw one frame (alpha: fraction of the next simulation step already elapsed, to interpolate sprites positions)"""
+        if not self.interpolation or self.is_paused:
+            alpha = None
+
+        # Monster positions are only copied to their rect when they are drawn
+        if self.core.monster_kinematics is not None:
+            self.core.monster_kinematics.sync_rects(alpha)
+        current_positions = self._interpolate_positions(alpha) if alpha is not None else {}
+
+        # Rebuild the static layer when zones geometry changed
+        if self.static_layer_key != (tuple(self.playzone), tuple(self.safezone.screen_rect)):
+            self._build_static_layer()
+
+        # Pause messages & profiler overlay are drawn over the screen, so they always need a full redraw (and the frame after to erase them)
+        if self.render_mode == "dirty" and not self.full_redraw and not (msg1 or msg2 or self.show_profiler):
+            dirty_rects = self._draw_dirty_frame()
+        else:
+            self._draw_full_frame(msg1, msg2)
+            dirty_rects = None
+            self.full_redraw = bool(msg1 or msg2 or self.show_profiler)
+
+        # Put back sprites at their simulated position (queued blits use copies of their rects)
+        for sprite, position in current_positions.items():
+            sprite.rect.topleft = position
+
+        if self.show_profiler:
+            self._draw_profiler_overlay()
+            self.profiler.mark("overlay")
+
+        # Draw the frame
+        self.render_queue.submit(self.screen)
+        self.profiler.mark("blits")
+
+        # Update display
+        if not self.headless:
+            if dirty_rects is None:
+                pygame.display.update()
+            else:
+                pygame.display.update(dirty_rects)
+        self.profiler.mark("display_update")
+
+        # Tick clock (no throttling in headless mode)
+        if self.headless:
+            self.clock.tick()
+        elif self.is_paused:
+            self.clock.tick(self.pause_fps)
+        else:
+            self.clock.tick(self.FPS)
+        self.profiler.mark("clock_tick")
+
+        # A frame ends after each draw
+        draw_calls, blits = self.render_queue.new_frame()
+        self.profiler.end_frame(sprites=len(self.player_group) + len(self.monster_group), draw_calls=draw_calls)
+        self.profiler.begin_frame()
+
+    def _draw_profiler_overlay(self):
+        """Draw FPS, frame time histogram & time spent per zone at the top left of the play zone"""
+        # Texts change every frame: refresh them a few times per second only
+        self.profiler_overlay_age -= 1
+        if self.profiler_overlay is None or self.profiler_overlay_age <= 0:
+            self.profiler_overlay = self.profiler.render_overlay(self.profiler_font, self.clock.get_fps())
+            self.profiler_overlay_age = 15
+        self.render_queue.add(self.profiler_overlay, (self.playzone.left + 5, self.playzone.top + 5), layer=LAYER_MESSAGES)
+
+    def _build_static_layer(self):
+        """Pre-composite everything that doesn't change between frames (background, safe zone & dashboard panels)"""
+        self.static_layer_key = (tuple(self.playzone), tuple(self.safezone.screen_rect))
+        self.static_layer = pygame.Surface(self.screen_rect.size)
         if self.background_color:
-            self.screen.fill(self.background_color)
-
-        # Blit the background
+            self.static_layer.fill(self.background_color)
         if self.background_image_path:
-            self.screen.blit(self.background_image, self.background_rect)
-
-        self.safezone.draw()
-
-        # Update elements when not paused
-        if not self.is_paused:
-            self.dashboard.update_timestamp(FPS=self.FPS)
-            self.player_group.update()
-            self.monster_group.update()
-            self.check_collisions()
-
-        # draw sprite groups
-        self.player_group.draw(self.screen)
-        self.monster_group.draw(self.screen)
-
-        # draw Dashboard & Color the play zone with the color of the target monster
-        self.dashboard.draw(lives=self.player.lives,
-                            warps=self.player.warps, target_monster=self.target_monster)
-        if self.target_monster and self.target_monster.color:
-            pygame.draw.rect(
-                self.screen, self.target_monster.color, self.playzone, 4)
+            self.background_image = ASSETS.get_image(
+                self.background_image_path, self.playzone.size, convert="opaque")
+            self.static_layer.blit(self.background_image, self.playzone)
+        self.safezone.draw(surface=self.static_layer)
+        self.dashboard.draw_background(surface=self.static_layer)
+        self.full_redraw = True
+        if self.logger:
+            self.logger.debug(f"Static layer built for play zone {self.playzone} & safe zone {self.safezone.screen_rect}")
+
+    def _draw_dashboard(self):
+        """Queue the Dashboard texts (its background is part of the static layer)"""
+        core = self.core
+        remaining = core.live_monsters.count(core.target_monster.name) if core.target_monster else None
+        self.render_queue.extend(self.dashboard.blit_items(core.scoreboard, lives=core.player.lives, warps=core.player.warps,
+                                                           target_monster=self.target_monster, remaining=remaining),
+                                 layer=LAYER_HUD)
+
+    def _draw_sprites(self) -> list:
+        """Queue the player & monster sprites, return the rects they are drawn at"""
+        player_items = [(sprite.image, sprite.rect.copy()) for sprite in self.player_group]
+        monster_items = [(sprite.image, sprite.rect.copy()) for sprite in self.monster_group]
+        self.render_queue.extend(player_items, layer=LAYER_PLAYER)
+        self.render_queue.extend(monster_items, layer=LAYER_MONSTERS)
+        self.drawn_rects = [rect for image, rect in player_items] + [rect for image, rect in monster_items]
+        return self.drawn_rects
+
+    def _draw_border(self) -> list:
+        """Queue the play zone borders in the color of the target monster, return their rects"""
+        if not (self.target_monster and self.target_monster.color):
+            return []
+        # Borders are 4 plain surfaces, built again when the color or the play zone change
+        color = self.target_monster.color
+        if self.border_key != (tuple(color), tuple(self.playzone)):
+            self.border_key = (tuple(color), tuple(self.playzone))
+            left, top, width, height = self.playzone
+            horizontal = pygame.Surface((width, 4))
+            horizontal.fill(color)
+            vertical = pygame.Surface((4, height))
+            vertical.fill(color)
+            self.border_items = [(horizontal, pygame.Rect(left, top, width, 4)),
+                                 (horizontal, pygame.Rect(left, top + height - 4, width, 4)),
+                                 (vertical, pygame.Rect(left, top, 4, height)),
+                                 (vertical, pygame.Rect(left + width - 4, top, 4, height))]
+        self.render_queue.extend(self.border_items, layer=LAYER_HUD)
+        return [rect for surface, rect in self.border_items]
+
+    def _draw_dirty_frame(self):
+        """Queue only the regions that changed since last frame, return them to update the display"""
+        # Erase sprites at the position they were last drawn
+        dirty_rects = self.drawn_rects
+        self.render_queue.extend([(self.static_layer, rect, rect) for rect in dirty_rects], layer=LAYER_BACKGROUND)
+        self.profiler.mark("background")
+
+        # Queue sprites
+        dirty_rects = dirty_rects + self._draw_sprites()
+        self.profiler.mark("sprites_draw")
+
+        # Queue Dashboard (texts may change every frame)
+        self.render_queue.add(self.static_layer, self.dashboard.screen_rect, self.dashboard.screen_rect, layer=LAYER_BACKGROUND)
+        self._draw_dashboard()
+        dirty_rects.append(self.dashboard.screen_rect)
+        self.profiler.mark("dashboard_draw")
+
+        # Color the play zone borders with the color of the target monster
+        dirty_rects += self._draw_border()
+        return dirty_rects
+
+    def _draw_full_frame(self, msg1: pygame.Surface = None, msg2: pygame.Surface = None):
+        """Queue the whole screen"""
+        # Static layer (background, safe zone & dashboard panels)
+        self.render_queue.add(self.static_layer, (0, 0), layer=LAYER_BACKGROUND)
+        self.profiler.mark("background")
+
+        # Queue sprites
+        self._draw_sprites()
+        self.profiler.mark("sprites_draw")
+
+        # Queue Dashboard & Color the play zone with the color of the target monster
+        self._draw_dashboard()
+        self.profiler.mark("dashboard_draw")
+        self._draw_border()
 
         # Display pause text
         if msg1:
             msg1_rect = msg1.get_rect()
             msg1_rect.center = self.screen_rect.center
-            self.screen.blit(msg1, msg1_rect)
+            self.render_queue.add(msg1, msg1_rect, layer=LAYER_MESSAGES)
         if msg2:
             msg2_rect = msg2.get_rect()
             msg2_rect.center = (self.screen_rect.centerx,
                                 self.screen_rect.centery + (self.font_size * 2))
-            self.screen.blit(msg2, msg2_rect)
+            self.render_queue.add(msg2, msg2_rect, layer=LAYER_MESSAGES)
 
-        # Update display and tick clock
-        pygame.display.update()
-        self.clock.tick(self.FPS)
+    def update_monsters(self):
+        """Move all monsters"""
+        self.core.update_monsters()
 
     def check_collisions(self):
-        """Check for collisions between player and monsters"""
-        # Check for collision between a player and an indiviaual monster
-        # WE must test the type of the monster to see if it matches the type of our target monster
-        collided_monster = pygame.sprite.spritecollideany(
-            self.player, self.monster_group)
-
-        # We collided with a monster
-        if collided_monster:
-            # Caught the correct monster
-            if collided_monster.name == self.target_monster.name:
-                self.dashboard.add_score()
-                self.target_monster.sound.play()
-                # Remove caught monster
-                collided_monster.remove(self.monster_group)
-                if (self.monster_group):
-                    # There are more monsters to catch
-                    self.choose_new_target()
-                else:
-                    # The round is complete
-                    self.player.reset_position()
-                    self.start_new_round()
+        """Check for collisions between player and monsters, play the outcome"""
+        self.play_outcome(self.core.check_collisions())
+
+    def play_outcome(self, outcome: int):
+        """Play the outcome of a core step (GameCore.check_collisions)"""
+        if outcome == CAUGHT or outcome == ROUND_COMPLETED:
+            # Caught the correct monster (its sprite goes back to the pool with it)
+            sprite = self._monster_sprite(self.core.collided)
+            sprite.sound.play()
+            sprite.kill()
+            if outcome == ROUND_COMPLETED:
+                self.start_new_round()
+        elif outcome == DIED:
             # Caught the wrong monster
-            else:
-                self.player.die_sound.play()
-                self.player.lives -= 1
-                self.player.reset_position()
-                # Check for game over
-                if self.player.lives <= 0:
-                    self.game_over()
-                else:
-                    if self.player.pause_when_die:
-                        self.pause_game(
-                            "You caught the wrong monster", "continue", with_animation=True)
-
-    def choose_new_target(self):
-        """Choose a new target monster for the player"""
-        self.target_monster = random.choice(self.monster_group.sprites())
+            self.player.die_sound.play()
+            if self.player.pause_when_die:
+                self.pause_game(
+                    "You caught the wrong monster", "continue", with_animation=True)
+        elif outcome == GAME_OVER:
+            self.player.die_sound.play()
+            self.game_over()
 
     def game_over(self):
-        self.player.reset_position()
-        self.target_monster = None
         self.pause_game(f"Game Over", enter_to_text="play again",
                         with_animation=True)
         self.reset_game()
 
     def input_player(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.is_paused = False
-                self.quit_game()
-            if event.type == pygame.KEYDOWN:
-                # Action when game is running
-                if not self.exit and not self.is_paused:
-                    if event.key == pygame.K_SPACE:
-                        self.player.warp()
-                    elif event.key == pygame.K_p:
-                        self.pause_game("PAUSED", enter_to_text="continue")
-                    elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
-                        self.quit_game()
-                    elif event.key == pygame.K_r:
-                        self.reset_game()
-                # Actions when game is paused
-                elif self.is_paused:
-                    if event.key == pygame.K_RETURN:
-                        self.is_paused = False
-                    elif event.key == pygame.K_q:
-                        self.is_paused = False
-                        self.quit_game()
-
-    def main_game_loop(self):
-        """The main game loop"""
+        for event in self.controls.events():
+            self.handle_event(event)
+
+    def handle_event(self, event: pygame.event.Event):
+        """React to a user event"""
+        if event.type == pygame.QUIT:
+            self.is_paused = False
+            self.quit_game()
+        if event.type == pygame.KEYDOWN:
+            # Action when game is running
+            if not self.exit and not self.is_paused:
+                if event.key == pygame.K_SPACE:
+                    if self.core.warp():
+                        self.player.warp_sound.play()
+                elif event.key == pygame.K_p:
+                    self.pause_game("PAUSED", enter_to_text="continue")
+                elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
+                    self.quit_game()
+                elif event.key == pygame.K_r:
+                    self.reset_game()
+                elif event.key == pygame.K_F3:
+                    self.show_profiler = not self.show_profiler
+            # Actions when game is paused
+            elif self.is_paused:
+                if event.key == pygame.K_RETURN:
+                    self.is_paused = False
+                elif event.key == pygame.K_q:
+                    self.is_paused = False
+                    self.quit_game()
+
+    def main_game_loop(self, max_frames: int = None, max_seconds: float = None, max_rounds: int = None):
+        """The main game loop (stopped after max_frames, max_seconds or max_rounds when specified)
+
+        With FixedTimestep, the simulation runs at TickRate using a time accumulator while frames are drawn as fast as
+        possible (up to FPS): when late, several steps are run before drawing the next frame.
+        In headless mode there is no real time to follow: one step is run per frame, as fast as possible.
+        A replay runs the number of steps per frame of the recorded game.
+        """
+        frame = 0
+        start_time = time.perf_counter()
+        self.reset_loop_clock()
+        self.profiler.begin_frame()
         while not self.exit:
-            # Update and draw the Game
-            self.update()
+            if self.fixed_loop:
+                now = time.perf_counter()
+                self.accumulator += now - self.loop_clock
+                self.loop_clock = now
+                # When too late to catch up, the remaining time is dropped instead of freezing the display
+                ticks = self.controls.frame_ticks(min(int(self.accumulator / self.tick_time), self.max_ticks_per_frame))
+                loop_restarts = self.loop_restarts
+                for tick in range(ticks):
+                    if self.is_paused or self.exit:
+                        break
+                    self.step()
+                    if self.loop_restarts != loop_restarts:
+                        break   # A pause during the step restarted the accumulator
+                    self.accumulator = max(0.0, self.accumulator - self.tick_time)
+                if ticks >= self.max_ticks_per_frame:
+                    self.accumulator = 0.0
+                # A replay follows the recorded steps, not the real time
+                self.accumulator = min(self.accumulator, self.tick_time)
+                self.render(alpha=self.accumulator / self.tick_time)
+            else:
+                # Update and draw the Game
+                self.update()
             # Check to see if user wants to quit or pause
             self.input_player()
+            if self.settings_watcher is not None:
+                for filename in self.settings_watcher.poll():
+                    self.reload_settings(filename)
+            self.profiler.mark("events")
+            frame += 1
+            if max_frames and frame >= max_frames:
+                self.quit_game()
+            if max_seconds and time.perf_counter() - start_time >= max_seconds:
+                self.quit_game()
+            if max_rounds and self.core.scoreboard.round_number > max_rounds:
+                self.quit_game()
 
         # End the game
+        self.prefetch_executor.shutdown()
+        self.controls.close()
+        if self.profiler_dump:
+            self.profiler.dump(self.profiler_dump)
+            if self.logger:
+                self.logger.info(f"Frame profile of the last {len(self.profiler.frames)} frames saved to '{self.profiler_dump}'")
         pygame.quit()
 
     def pause_game(self, msg, enter_to_text, with_animation=False):
         """Pause the game"""
         # Create the pause text
-        msg = self.font.render(msg, True, self.font_color)
-        sub_text = self.font.render(
-            f"Press 'Enter' to {enter_to_text}", True, self.font_color)
+        msg = TEXTS.render(self.font, msg, self.font_color)
+        sub_text = TEXTS.render(
+            self.font, f"Press 'Enter' to {enter_to_text}", self.font_color)
 
-        # Pause the game
+        # Pause the game (only draw one frame when pause screens are skipped)
         self.is_paused = True
+        self.update(msg1=msg, msg2=sub_text)
+        if self.auto_continue:
+            self.is_paused = False
         while self.is_paused:
             if with_animation:
-                # Update and draw sprite groups
-                self.monster_group.update()
-            self.update(msg1=msg, msg2=sub_text)
-            self.input_player()
+                # Update and draw sprite groups (at PauseFPS)
+                self.update_monsters()
+                self.update(msg1=msg, msg2=sub_text)
+                self.input_player()
+            else:
+                # Nothing moves: sleep until the user does something
+                event = self.controls.wait(self.pause_wait_timeout)
+                self.profiler.skip()    # Waiting is not part of any frame
+                if event.type == pygame.NOEVENT:
+                    continue
+                self.handle_event(event)
+                if event.type == pygame.WINDOWEXPOSED and self.is_paused:
+                    self.update(msg1=msg, msg2=sub_text)
+        # Time spent in pause must not be simulated, nor profiled in the frame the pause was entered from
+        self.reset_loop_clock()
+        self.profiler.skip()
+
+    def reset_loop_clock(self):
+        """Restart the fixed timestep accumulator from now"""
+        self.loop_clock = time.perf_counter()
+        self.accumulator = 0.0
+        self.loop_restarts += 1
 
     def quit_game(self):
         self.exit = True
 
     def reset_game(self):
         """Reset the game"""
-        self.dashboard.reset_score()
-        self.player.reset_lives()
-        self.player.reset_position()
+        self.core.reset()
         self.start_new_round()
 
     def start_new_round(self):
         """Populate board with new monsters"""
-        if self.dashboard.round_number > 0:
+        core = self.core
+        # Give any remaining monsters from a game reset back to their pool
+        core.clear_monsters()
+        self.monster_group.empty()
+
+        # Prepare next round monsters while the player reads the pause screen
+        next_round = self.prefetch_executor.submit(core.prepare_round, core.scoreboard.round_number + 1)
+
+        if core.scoreboard.round_number > 0:
             # Provide a score bonus based on how quickly the round was finished
-            self.dashboard.get_bonus()
-            self.pause_game(f"level {self.dashboard.round_number} completed on {self.dashboard.round_time} sec. Bonus Points : {self.dashboard.bonus}",
+            core.scoreboard.get_bonus()
+            self.pause_game(f"level {core.scoreboard.round_number} completed on {core.scoreboard.round_time} sec. Bonus Points : {core.scoreboard.bonus}",
                             enter_to_text="for next level")
 
-        # Reset round values
-        self.dashboard.new_round()
-        self.player.warps += 1
+        # Add monsters & choose a new target monster
+        core.start_new_round(next_round.result())
+        self._sync_monster_sprites()
 
-        # Remove any remaining monsters from a game reset
-        for monster in self.monster_group:
-            self.monster_group.remove(monster)
+        if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Round {core.scoreboard.round_number} assets cache: {ASSETS.stats()}")
+            self.logger.debug(f"Round {core.scoreboard.round_number} monster pools: "
+                              f"{ {name: pool.stats() for name, pool in core.monster_pools.items()} }")
 
-        # Add monsters to the monster group
-        cnt = 0
-        for i in range(self.dashboard.round_number):
-            for ennemy in self.ennemies_lst:
-                monster = Monster(
-                    settings=ennemy, play_zone=self.playzone, logger=self.logger)
-                self.monster_group.add(monster)
-
-        # Choose a new target monster
-        self.choose_new_target()
         self.next_level_sound.play()
 
+    def reload_settings(self, filename: str):
+        """Apply the changes of a settings file to the subsystem using it (an invalid file is ignored)"""
+        reloaders = {"game.yaml": (GameSettings, self._reload_game_settings),
+                     "player.yaml": (PlayerSettings, self.player.reload_settings),
+                     "dashboard.yaml": (ZoneSettings, self.dashboard.apply_settings),
+                     "safezone.yaml": (ZoneSettings, self.safezone.apply_settings),
+                     "ennemies.yaml": (EnemyType, self._reload_ennemies)}
+        if filename not in reloaders:
+            return
+        record_class, apply = reloaders[filename]
+        overrides = self.settings_overrides if filename == "game.yaml" else None
+        try:
+            settings = load_settings(record_class, filename, self.logger, overrides=overrides, exit_on_error=False)
+            self._check_layout(filename, settings)
+        except SettingsError as e:
+            if self.logger:
+                self.logger.error(f"{str(e)}, previous settings are kept")
+            return
+        apply(settings)
+        if filename in ("dashboard.yaml", "safezone.yaml"):
+            self._fit_playzone()
+        self._build_static_layer()
+        if self.logger:
+            self.logger.info(f"Settings of {filename} applied")
+
+    def _check_layout(self, filename: str, settings):
+        """Raise SettingsError when the new settings of filename leave no room for the player or a monster in the play zone"""
+        dashboard_height = settings.height if filename == "dashboard.yaml" else self.dashboard.zone_height
+        safezone_height = settings.height if filename == "safezone.yaml" else self.safezone.zone_height
+        ennemies_lst = settings if filename == "ennemies.yaml" else self.core.ennemies_lst
+        player_size = settings.size if filename == "player.yaml" else self.core.player.settings.size
+        play_zone = zones_layout(self.screen.get_size(), dashboard_height, safezone_height)[1]
+        sizes = [player_size] + [ennemy.size for ennemy in ennemies_lst]
+        width, height = max(width for width, height in sizes), max(height for width, height in sizes)
+        if play_zone.width <= width or play_zone.height <= height:
+            raise SettingsError(f"{filename}: the play zone would be {play_zone.width}x{play_zone.height}, "
+                                f"smaller than the biggest sprite ({width}x{height})")
+
+    def _reload_game_settings(self, settings: GameSettings):
+        """Apply new game settings, except the ones only used when the game starts"""
+        restart_fields = ("screen_size", "headless", "collision_mode", "monster_engine", "profiler_frames")
+        for field in restart_fields:
+            if getattr(settings, field) != getattr(self.settings, field) and self.logger:
+                self.logger.warning(f"'{field}' game setting change needs a restart")
+        kept = {name: getattr(self, name) for name in ("screen_size", "headless", "collision_mode", "monster_engine")}
+        previous = self.settings
+        self.settings = settings
+        self._init_var_from_settings()
+        for name, value in kept.items():
+            setattr(self, name, value)
+        self.fixed_loop = self.fixed_timestep and not self.headless
+        self.profiler_frames = previous.profiler_frames
+
+        pygame.display.set_caption(self.title)
+        if settings.icon and settings.icon != previous.icon:
+            self.icon = ASSETS.get_image(settings.icon)
+            pygame.display.set_icon(self.icon)
+        self.next_level_sound = ASSETS.get_sound(settings.sound_next_level)
+        if settings.font != previous.font:
+            self.font = pygame.font.Font(settings.font.path, size=self.font_size)
+        self.core.apply_settings(settings)
+        self.reset_loop_clock()
+
+    def _fit_playzone(self):
+        """Resize the play zone between dashboard & safe zone, keeping player & monsters inside"""
+        self.playzone.update(zones_layout(self.screen.get_size(), self.dashboard.zone_height, self.safezone.zone_height)[1])
+        self.core.fit_zones()
+
+    def _reload_ennemies(self, ennemies_lst: tuple):
+        """Use new ennemy types: live monsters of a changed type are replaced where they are, removed types disappear"""
+        self.core.reload_ennemies(ennemies_lst)
+        # Sprites of replaced monsters are not needed anymore
+        self.monster_sprites = {monster: sprite for monster, sprite in self.monster_sprites.items()
+                                if monster.settings in ennemies_lst}
+        self._load_monster_assets()
+        self._sync_monster_sprites()
+        if not self.core.live_monsters:
+            self.start_new_round()
+
     def test_reduce_playzone(self):
         """ Reduce the play zone & increse safe zone heights"""
         self.playzone.height -= 10
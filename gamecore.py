@@ -0,0 +1,504 @@
+# Standard Python Modules
+import hashlib
+import random
+
+# External Python Modules
+import pygame
+
+# Personal Python Modules
+from const import *
+from controls import MOVE_LEFT, MOVE_RIGHT, MOVE_UP, MOVE_DOWN
+from gamesettings import GameSettings, PlayerSettings, ZoneSettings, EnemyType, load_settings
+from kinematics import MonsterKinematics, np
+from utils.coloredlog import ColorLogger
+from utils.frameprofiler import FrameProfiler
+from utils.spatialhash import SpatialHash
+
+# State & rules of the game: positions, monster types, score, lives, warps, round & timer.
+# Nothing here draws or plays a sound (only pygame.Rect is used): the core can be stepped without a display, and
+# Game, Player, Monster & Dashboard are the views rendering it.
+
+# Outcome of a step (GameCore.check_collisions)
+PLAYING = 0             # Nothing caught
+CAUGHT = 1              # A monster of the target type was caught, there are more to catch
+ROUND_COMPLETED = 2     # The last monster was caught: start_new_round() is expected
+DIED = 3                # A monster of another type was caught: one life lost
+GAME_OVER = 4           # The last life was lost: reset() then start_new_round() are expected
+
+
+def zones_layout(screen_size: tuple, dashboard_height: int, safezone_height: int) -> tuple:
+    """Return the rects of the dashboard (TOP of screen), play zone (middle) & safe zone (BOTTOM) of a screen"""
+    width, height = screen_size
+    return (pygame.Rect(0, 0, width, dashboard_height),
+            pygame.Rect(0, dashboard_height+1, width, height - dashboard_height - safezone_height),
+            pygame.Rect(0, height-safezone_height+1, width, safezone_height))
+
+
+class MonsterState():
+    """Position, motion & type of a monster"""
+    __slots__ = ("settings", "rng", "play_zone", "rect", "dx", "dy", "velocity", "spatial_index")
+
+    def __init__(self, settings: EnemyType, play_zone: pygame.Rect, rng: random.Random):
+        """rng: random generator of the game, for reproducible games"""
+        self.settings = settings            # Shared by all the monsters of the same type
+        self.rng = rng
+        self.play_zone = play_zone
+        self.rect = pygame.Rect((0, 0), settings.size)
+        self.spatial_index: SpatialHash = None      # Collision index the monster must be kept up to date in
+        self.respawn()
+
+    @property
+    def name(self) -> str:
+        return self.settings.name
+
+    def update(self):
+        """Move the monster"""
+        self.rect.x += self.dx*self.velocity
+        self.rect.y += self.dy*self.velocity
+
+        # Bounce the monster off the edges of the play zone
+        if self.rect.left <= self.play_zone.left or self.rect.right >= self.play_zone.right:
+            self.dx = -1*self.dx
+        if self.rect.top <= self.play_zone.top or self.rect.bottom >= self.play_zone.bottom:
+            self.dy = -1*self.dy
+
+        if self.spatial_index is not None:
+            self.spatial_index.move(self)
+
+    def respawn(self):
+        """Set a new random position in play_zone & a new random motion"""
+        self.rect.topleft = (self.rng.randint(self.play_zone.left, self.play_zone.right - self.rect.width),
+                             self.rng.randint(self.play_zone.top, self.play_zone.bottom - self.rect.height))
+        self.dx = self.rng.choice([-1, 1])
+        self.dy = self.rng.choice([-1, 1])
+        self.velocity = self.rng.randint(1, 5)
+
+
+class MonsterIndex():
+    """Live monsters indexed by ennemy name, all operations in constant time"""
+    def __init__(self):
+        self.monsters: list[MonsterState] = []      # All live monsters, for random choice
+        self.slots = {}                             # monster: position in self.monsters
+        self.by_name = {}                           # ennemy name: {monster: None}
+
+    def __len__(self):
+        return len(self.monsters)
+
+    def add(self, monster: MonsterState):
+        self.slots[monster] = len(self.monsters)
+        self.monsters.append(monster)
+        self.by_name.setdefault(monster.name, {})[monster] = None
+
+    def remove(self, monster: MonsterState):
+        slot = self.slots.pop(monster, None)
+        if slot is None:
+            return
+        # Fill the hole with the last monster to keep the list compact
+        last = self.monsters.pop()
+        if last is not monster:
+            self.monsters[slot] = last
+            self.slots[last] = slot
+        del self.by_name[monster.name][monster]
+
+    def clear(self):
+        self.monsters.clear()
+        self.slots.clear()
+        self.by_name.clear()
+
+    def count(self, name: str) -> int:
+        """Return the number of live monsters of an ennemy type"""
+        return len(self.by_name.get(name, ()))
+
+    def choice(self, rng: random.Random) -> MonsterState:
+        """Return a random live monster"""
+        return rng.choice(self.monsters)
+
+
+class MonsterPool():
+    """A pool of reusable monsters of one ennemy type"""
+    def __init__(self, settings: EnemyType, play_zone: pygame.Rect, rng: random.Random, logger: ColorLogger = None):
+        self.logger = logger
+        self.settings = settings
+        self.rng = rng
+        self.play_zone = play_zone
+        self.free: list[MonsterState] = []
+        self.size = 0           # Number of monsters ever created by the pool
+        self.live = 0           # Number of monsters currently out of the pool
+        self.high_water = 0     # Highest number of live monsters seen
+
+    def acquire(self) -> MonsterState:
+        """Return a re-armed monster from the pool, or a new one when the pool is empty"""
+        if self.free:
+            monster = self.free.pop()
+            monster.respawn()
+        else:
+            monster = MonsterState(settings=self.settings, play_zone=self.play_zone, rng=self.rng)
+            self.size += 1
+        self.live += 1
+        self.high_water = max(self.high_water, self.live)
+        return monster
+
+    def release(self, monster: MonsterState):
+        """Give the monster back to the pool"""
+        self.free.append(monster)
+        self.live -= 1
+
+    def stats(self) -> dict:
+        return {"size": self.size, "live": self.live, "high_water": self.high_water}
+
+
+class PlayerState():
+    """Position, lives & warps of the player"""
+
+    def __init__(self, settings: PlayerSettings, play_zone: pygame.Rect, safe_zone: pygame.Rect):
+        self.play_zone = play_zone
+        self.safe_zone = safe_zone
+        self.rect = pygame.Rect((0, 0), settings.size)
+        self.apply_settings(settings)
+        self.reset_position()
+        self.reset_lives()
+
+    def apply_settings(self, settings: PlayerSettings):
+        """Use settings, rect is resized in place around its center as the player sprite shares it"""
+        self.settings = settings
+        self.starting_lives = settings.lives
+        self.starting_warps = settings.warps
+        self.velocity = settings.velocity
+        center = self.rect.center
+        self.rect.size = settings.size
+        self.rect.center = center
+
+    def reload_settings(self, settings: PlayerSettings):
+        """Use new settings during a game: current lives & warps change as much as the starting ones"""
+        lives_change = settings.lives - self.starting_lives
+        warps_change = settings.warps - self.starting_warps
+        self.apply_settings(settings)
+        self.lives = max(1, self.lives + lives_change)
+        self.warps = max(0, self.warps + warps_change)
+
+    def move(self, moves: int):
+        """Move the player within the play zone (moves: directions held, MOVE_* bits from controls)"""
+        if moves & MOVE_LEFT and self.rect.left >= self.play_zone.left + self.velocity:
+            self.rect.x -= self.velocity
+        if moves & MOVE_RIGHT and self.rect.right <= self.play_zone.width - self.velocity:
+            self.rect.x += self.velocity
+        if moves & MOVE_UP and self.rect.top >= self.play_zone.top + self.velocity:
+            self.rect.y -= self.velocity
+        if moves & MOVE_DOWN and self.rect.bottom <= self.play_zone.bottom - self.velocity:
+            self.rect.y += self.velocity
+
+    def reset_lives(self):
+        """Resets the players lives"""
+        self.lives = self.starting_lives
+        self.warps = self.starting_warps
+
+    def reset_position(self):
+        """Resets the players position"""
+        self.rect.centerx = self.safe_zone.centerx
+        self.rect.bottom = self.safe_zone.bottom
+
+    def warp(self) -> bool:
+        """Warp the player to the bottom 'safe zone', return False when not possible"""
+        # second condition to verify the player is not already in the safe zone
+        if self.warps > 0 and self.rect.top < self.safe_zone.top:
+            self.warps -= 1
+            self.rect.bottom = self.safe_zone.bottom
+            return True
+        return False
+
+
+class Scoreboard():
+    """Score, round number & round time"""
+
+    def __init__(self, round_bonus: int = 10000):
+        """round_bonus: bonus points of a round finished in no time, per round number"""
+        self.round_bonus = round_bonus
+        self.reset_score()
+
+    def add_score(self):
+        self.score += 100*self.round_number
+
+    def get_bonus(self):
+        # Provide a score bonus based on how quickly the round was finished
+        self.bonus = int(self.round_bonus*self.round_number/(1 + self.round_time))
+
+    def new_round(self):
+        self.get_bonus()
+        self.score += self.bonus
+        self.round_number += 1
+        self.round_time = 0
+        self.round_clock = 0.0
+
+    def reset_score(self):
+        self.score = 0
+        self.bonus = 0
+        self.round_number = 0
+        self.round_time = 0
+        self.round_clock = 0.0
+
+    def update_timestamp(self, elapsed: float):
+        """Update timestamp with the elapsed time (in seconds) of a simulation step"""
+        self.round_clock += elapsed
+        self.round_time = int(self.round_clock)
+
+
+class GameCore():
+    """Rules of the game applied to its state, one simulation step at a time
+
+    The play & safe zones rects are shared with the views, which may resize them in place (see fit_zones).
+    """
+
+    def __init__(self, settings: GameSettings, player_settings: PlayerSettings, ennemies_lst: tuple,
+                 play_zone: pygame.Rect, safe_zone: pygame.Rect, rng: random.Random, logger: ColorLogger = None):
+        """rng: random generator of the game, every random draw of the game uses it"""
+        self.logger = logger
+        self.rng = rng
+        self.play_zone = play_zone
+        self.safe_zone = safe_zone
+        self.player = PlayerState(player_settings, play_zone, safe_zone)
+        self.scoreboard = Scoreboard()
+
+        # Monster engine & collision index
+        self.ennemies_lst = ennemies_lst
+        self.monster_engine = settings.monster_engine
+        self.collision_mode = settings.collision_mode
+        self.monster_kinematics: MonsterKinematics = None
+        if self.monster_engine == "numpy" and np is None:
+            if self.logger:
+                self.logger.warning(f"NumPy is not installed, MonsterEngine 'python' is used")
+            self.monster_engine = "python"
+        if self.monster_engine == "numpy":
+            # The engine also checks collisions on its arrays
+            self.monster_kinematics = MonsterKinematics(play_zone=self.play_zone, keep_previous=settings.interpolation,
+                                                        logger=self.logger)
+            self.collision_mode = "linear"
+        self.monster_index: SpatialHash = None
+        if self.collision_mode == "grid":
+            # Cells as big as the biggest monster: a monster covers at most 4 cells
+            self.monster_index = SpatialHash(cell_size=max(max(ennemy.size) for ennemy in ennemies_lst))
+
+        # Monsters
+        self.monster_pools = {ennemy.name: MonsterPool(settings=ennemy, play_zone=self.play_zone, rng=self.rng, logger=self.logger)
+                              for ennemy in ennemies_lst}
+        self.monsters = {}                      # Live monsters in the order they were added {monster: None}
+        self.live_monsters = MonsterIndex()
+        self.target_monster: MonsterState = None
+        self.collided: MonsterState = None      # Monster caught during the last collisions check
+        self.games_over = 0                     # Number of games lost since the core was built
+
+        self.apply_settings(settings)
+
+    @classmethod
+    def from_settings_files(cls, rng: random.Random, settings_overrides: dict = None, logger: ColorLogger = None) -> "GameCore":
+        """Build a core from the settings files, with the zones layout of the game screen (no display needed)"""
+        settings = load_settings(GameSettings, "game.yaml", logger, overrides=settings_overrides)
+        dashboard = load_settings(ZoneSettings, "dashboard.yaml", logger)
+        safezone = load_settings(ZoneSettings, "safezone.yaml", logger)
+        dashboard_rect, play_zone, safe_zone = zones_layout(settings.screen_size, dashboard.height, safezone.height)
+        return cls(settings=settings, player_settings=load_settings(PlayerSettings, "player.yaml", logger),
+                   ennemies_lst=load_settings(EnemyType, "ennemies.yaml", logger),
+                   play_zone=play_zone, safe_zone=safe_zone, rng=rng, logger=logger)
+
+    def apply_settings(self, settings: GameSettings):
+        """Use game settings (monster engine & collision mode are only read when the core is built)"""
+        self.tick_time: float = 1 / settings.tick_rate
+        self.spawn_per_round = settings.spawn_per_round
+        self.scoreboard.round_bonus = settings.round_bonus
+        if self.monster_kinematics is not None:
+            self.monster_kinematics.keep_previous = settings.interpolation
+
+    def step(self, moves: int = 0, profiler: FrameProfiler = None) -> int:
+        """Advance the game by one tick (moves: directions held, MOVE_* bits), return the outcome of the step
+
+        profiler: when specified, the time of each phase is marked in it (player_update, monster_update & collisions)
+        """
+        self.scoreboard.update_timestamp(self.tick_time)
+        self.player.move(moves)
+        if profiler:
+            profiler.mark("player_update")
+        self.update_monsters()
+        if profiler:
+            profiler.mark("monster_update")
+        outcome = self.check_collisions()
+        if profiler:
+            profiler.mark("collisions")
+        return outcome
+
+    def update_monsters(self):
+        """Move all monsters"""
+        if self.monster_kinematics is not None:
+            self.monster_kinematics.update()
+        else:
+            for monster in self.monsters:
+                monster.update()
+
+    def check_collisions(self) -> int:
+        """Check for collisions between player and monsters, return the outcome (collided monster in self.collided)"""
+        # WE must test the type of the monster to see if it matches the type of our target monster
+        player = self.player
+        if self.monster_kinematics is not None:
+            collided_monster = self.monster_kinematics.collide_any(player.rect)
+        elif self.monster_index is not None:
+            collided_monster = self.monster_index.collide_any(player)
+        else:
+            colliderect = player.rect.colliderect
+            collided_monster = next((monster for monster in self.monsters if colliderect(monster.rect)), None)
+        self.collided = collided_monster
+        if collided_monster is None:
+            return PLAYING
+
+        # Caught the correct monster
+        if collided_monster.name == self.target_monster.name:
+            self.scoreboard.add_score()
+            # Give caught monster back to its pool
+            self.release_monster(collided_monster)
+            if self.live_monsters:
+                # There are more monsters to catch
+                self.choose_new_target()
+                return CAUGHT
+            # The round is complete
+            player.reset_position()
+            return ROUND_COMPLETED
+
+        # Caught the wrong monster
+        player.lives -= 1
+        player.reset_position()
+        if player.lives <= 0:
+            self.target_monster = None
+            self.games_over += 1
+            return GAME_OVER
+        return DIED
+
+    def warp(self) -> bool:
+        """Warp the player to the safe zone, return False when not possible"""
+        return self.player.warp()
+
+    def choose_new_target(self):
+        """Choose a new target monster for the player"""
+        self.target_monster = self.live_monsters.choice(self.rng)
+
+    def add_monster(self, monster: MonsterState):
+        """Put monster in the game (kinematics engine has to be loaded afterwards)"""
+        self.monsters[monster] = None
+        self.live_monsters.add(monster)
+        if self.monster_index is not None:
+            monster.spatial_index = self.monster_index
+            self.monster_index.add(monster)
+
+    def release_monster(self, monster: MonsterState):
+        """Remove monster from the game & give it back to its pool"""
+        if self.monster_kinematics is not None:
+            self.monster_kinematics.remove(monster)
+        if self.monster_index is not None:
+            self.monster_index.remove(monster)
+            monster.spatial_index = None
+        self.live_monsters.remove(monster)
+        del self.monsters[monster]
+        self.monster_pools[monster.name].release(monster)
+
+    def clear_monsters(self):
+        """Give all live monsters back to their pool"""
+        for monster in list(self.monsters):
+            self.release_monster(monster)
+
+    def prepare_round(self, round_number: int) -> list:
+        """Take the monsters of a round out of their pool, with new positions & motions (may run on another thread)"""
+        return [self.monster_pools[ennemy.name].acquire()
+                for i in range(round_number * self.spawn_per_round) for ennemy in self.ennemies_lst]
+
+    def start_new_round(self, monsters: list = None):
+        """Populate board with the monsters of the next round (monsters: prepared by prepare_round, default: prepared now)"""
+        # Give any remaining monsters from a game reset back to their pool
+        self.clear_monsters()
+        if monsters is None:
+            monsters = self.prepare_round(self.scoreboard.round_number + 1)
+
+        # Reset round values
+        self.scoreboard.new_round()
+        self.player.warps += 1
+
+        for monster in monsters:
+            self.add_monster(monster)
+        if self.monster_kinematics is not None:
+            self.monster_kinematics.load(list(self.monsters))
+
+        # Choose a new target monster
+        self.choose_new_target()
+
+    def reset(self):
+        """Reset score, lives & player position for a new game (start_new_round() starts it)"""
+        self.scoreboard.reset_score()
+        self.player.reset_lives()
+        self.player.reset_position()
+
+    def fit_zones(self):
+        """Keep player & monsters inside the zones, after their rects were resized"""
+        self.player.rect.clamp_ip(self.play_zone.union(self.safe_zone))
+        if self.monster_kinematics is not None:
+            self.monster_kinematics.sync_rects()
+            self.monster_kinematics.sync_motion()
+        for monster in self.monsters:
+            monster.rect.clamp_ip(self.play_zone)
+            if self.monster_index is not None:
+                self.monster_index.move(monster)
+        if self.monster_kinematics is not None:
+            self.monster_kinematics.load(list(self.monsters))
+
+    def state_digest(self) -> bytes:
+        """Return a 16 bytes digest of the whole game state (2 games in the same state have the same digest)"""
+        if self.monster_kinematics is not None:
+            # Sprites rects may hold interpolated positions
+            self.monster_kinematics.sync_rects()
+            self.monster_kinematics.sync_motion()
+        scoreboard, player = self.scoreboard, self.player
+        state = (scoreboard.score, scoreboard.bonus, scoreboard.round_number, scoreboard.round_clock, player.lives,
+                 player.warps, tuple(player.rect), self.target_monster and self.target_monster.name,
+                 [(monster.name, tuple(monster.rect), monster.dx, monster.dy, monster.velocity) for monster in self.monsters])
+        return hashlib.md5(repr(state).encode()).digest()
+
+    def reload_ennemies(self, ennemies_lst: tuple):
+        """Use new ennemy types: live monsters of a changed type are replaced where they are, removed types disappear
+
+        When no monster is left, start_new_round() is expected.
+        """
+        types = {ennemy.name: ennemy for ennemy in ennemies_lst}
+        if self.monster_kinematics is not None:
+            self.monster_kinematics.sync_rects()
+            self.monster_kinematics.sync_motion()
+
+        # Give outdated monsters back to their (outdated) pool
+        replaced = []
+        for monster in list(self.monsters):
+            if types.get(monster.name) != monster.settings:
+                replaced.append((monster, monster.rect.center, monster.dx, monster.dy, monster.velocity))
+                self.release_monster(monster)
+
+        # Pools of unchanged types are kept with their monsters
+        self.ennemies_lst = ennemies_lst
+        self.monster_pools = {ennemy.name: pool if (pool := self.monster_pools.get(ennemy.name)) and pool.settings == ennemy
+                              else MonsterPool(settings=ennemy, play_zone=self.play_zone, rng=self.rng, logger=self.logger)
+                              for ennemy in ennemies_lst}
+        if self.monster_index is not None:
+            # Cells must stay as big as the biggest monster
+            cell_size = max(max(ennemy.size) for ennemy in ennemies_lst)
+            if cell_size != self.monster_index.cell_size:
+                self.monster_index = SpatialHash(cell_size=cell_size)
+                for monster in self.monsters:
+                    monster.spatial_index = self.monster_index
+                    self.monster_index.add(monster)
+
+        for old_monster, center, dx, dy, velocity in replaced:
+            if old_monster.name not in types:
+                continue
+            monster = self.monster_pools[old_monster.name].acquire()
+            monster.rect.center = center
+            monster.rect.clamp_ip(self.play_zone)
+            monster.dx, monster.dy, monster.velocity = dx, dy, velocity
+            self.add_monster(monster)
+            if self.target_monster is old_monster:
+                self.target_monster = monster
+        if self.monster_kinematics is not None:
+            self.monster_kinematics.load(list(self.monsters))
+
+        if self.live_monsters and (self.target_monster is None or not self.live_monsters.count(self.target_monster.name)):
+            self.choose_new_target()
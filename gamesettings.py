@@ -0,0 +1,281 @@
+# Standard Python Modules
+import logging
+import os
+from dataclasses import dataclass
+
+# External Python Modules
+
+# Personal Python Modules
+from const import *
+from utils.parameterfile import ParameterFile
+from utils.coloredlog import ColorLogger
+
+# Settings files are validated once at startup into immutable records, shared by reference by every object using them.
+
+
+class SettingsError(Exception):
+    """A settings field is missing or has a wrong format"""
+
+
+class SettingsReader():
+    """Read & validate the fields of a settings dictionary"""
+
+    def __init__(self, settings: dict, source: str):
+        self.settings = settings if isinstance(settings, dict) else {}
+        self.source = source
+        self.read_fields = set()        # Top level fields asked for, found or not
+        if not isinstance(settings, dict):
+            raise SettingsError(f"{source}: a dictionary of fields is expected")
+
+    def get(self, field: str, check, default=...):
+        """Return field value (nested fields separated by '.') after check, or default when the field is missing"""
+        self.read_fields.add(field.split(".")[0])
+        value = self.settings
+        for key in field.split("."):
+            if not isinstance(value, dict) or key not in value:
+                if default is ...:
+                    raise SettingsError(f"'{field}' field not found in {self.source}")
+                return default
+            value = value[key]
+        try:
+            return check(value)
+        except (TypeError, ValueError) as e:
+            raise SettingsError(f"'{field}' field in {self.source}: {str(e)}") from None
+
+
+# Field checks: return the value to store, raise ValueError when invalid
+def integer(value) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"integer expected, got {value!r}")
+    return value
+
+def positive_integer(value) -> int:
+    if integer(value) <= 0:
+        raise ValueError(f"positive integer expected, got {value!r}")
+    return value
+
+def non_negative_integer(value) -> int:
+    if integer(value) < 0:
+        raise ValueError(f"integer >= 0 expected, got {value!r}")
+    return value
+
+def positive_number(value) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"positive number expected, got {value!r}")
+    return value
+
+def boolean(value) -> bool:
+    if not isinstance(value, bool):
+        raise ValueError(f"True or False expected, got {value!r}")
+    return value
+
+def text(value) -> str:
+    if not isinstance(value, str):
+        raise ValueError(f"text expected, got {value!r}")
+    return value
+
+def optional(check):
+    """Accept null in addition to the values accepted by check"""
+    return lambda value: None if value is None else check(value)
+
+def choice(*choices):
+    def check(value):
+        if value not in choices:
+            raise ValueError(f"one of {', '.join(map(str, choices))} expected, got {value!r}")
+        return value
+    return check
+
+def file_path(value) -> str:
+    if not os.path.isfile(text(value)):
+        raise ValueError(f"file '{value}' not found")
+    return value
+
+def color(value) -> tuple:
+    if not isinstance(value, (list, tuple)) or len(value) not in (3, 4) or not all(0 <= integer(c) <= 255 for c in value):
+        raise ValueError(f"[red, green, blue] with values from 0 to 255 expected, got {value!r}")
+    return tuple(value)
+
+def size(value) -> tuple:
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise ValueError(f"[width, height] expected, got {value!r}")
+    return (positive_integer(value[0]), positive_integer(value[1]))
+
+
+@dataclass(frozen=True, slots=True)
+class FontSettings:
+    path: str
+    size: int
+    color: tuple
+
+    @classmethod
+    def read(cls, reader: SettingsReader, field: str = "Font") -> "FontSettings":
+        return cls(path=reader.get(f"{field}.Path", file_path),
+                   size=reader.get(f"{field}.Size", positive_integer),
+                   color=reader.get(f"{field}.Color", color))
+
+
+@dataclass(frozen=True, slots=True)
+class BackgroundSettings:
+    color: tuple
+    image: str
+
+    @classmethod
+    def read(cls, reader: SettingsReader, field: str = "Background") -> "BackgroundSettings":
+        return cls(color=reader.get(f"{field}.Color", optional(color)),
+                   image=reader.get(f"{field}.Image", optional(file_path)))
+
+
+@dataclass(frozen=True, slots=True)
+class ZoneSettings:
+    """Dashboard & SafeZone settings"""
+    height: int
+    font: FontSettings
+    background: BackgroundSettings
+
+    @classmethod
+    def read(cls, reader: SettingsReader) -> "ZoneSettings":
+        return cls(height=reader.get("Height", positive_integer),
+                   font=FontSettings.read(reader),
+                   background=BackgroundSettings.read(reader))
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerSettings:
+    lives: int
+    warps: int
+    velocity: int
+    sprite: bool
+    pause_when_die: bool
+    image_path: str
+    size: tuple
+    sound_die: str
+    sound_warp: str
+
+    @classmethod
+    def read(cls, reader: SettingsReader) -> "PlayerSettings":
+        return cls(lives=reader.get("Lives", positive_integer),
+                   warps=reader.get("Warps", integer),
+                   velocity=reader.get("Velocity", positive_integer),
+                   sprite=reader.get("Sprite", boolean),
+                   pause_when_die=reader.get("PauseWhenDie", boolean),
+                   image_path=reader.get("Image.Path", file_path),
+                   size=reader.get("Image.Size", size),
+                   sound_die=reader.get("Sound.die", file_path),
+                   sound_warp=reader.get("Sound.warp", file_path))
+
+
+@dataclass(frozen=True, slots=True)
+class EnemyType:
+    name: str
+    sprite: bool
+    image_path: str
+    size: tuple
+    color: tuple
+    sound_collision: str
+
+    @classmethod
+    def read(cls, reader: SettingsReader) -> "EnemyType":
+        return cls(name=reader.get("Name", text),
+                   sprite=reader.get("Sprite", boolean),
+                   image_path=reader.get("Image.Path", file_path),
+                   size=reader.get("Image.Size", size),
+                   color=reader.get("Image.Color", optional(color)),
+                   sound_collision=reader.get("Sound.Collision", file_path))
+
+
+@dataclass(frozen=True, slots=True)
+class GameSettings:
+    title: str
+    icon: str
+    fps: int
+    fixed_timestep: bool
+    tick_rate: int
+    max_ticks_per_frame: int
+    interpolation: bool
+    pause_fps: int
+    pause_wait_timeout: int
+    profiler_frames: int
+    profiler_dump: str
+    headless: bool
+    seed: int
+    settings_reload: bool
+    settings_poll: float
+    render_mode: str
+    collision_mode: str
+    monster_engine: str
+    spawn_per_round: int
+    round_bonus: int
+    screen_size: tuple
+    font: FontSettings
+    background: BackgroundSettings
+    music_play: str
+    music_pause: str
+    sound_next_level: str
+
+    @classmethod
+    def read(cls, reader: SettingsReader) -> "GameSettings":
+        fps = reader.get("FPS", positive_integer)
+        return cls(title=reader.get("Title", text),
+                   icon=reader.get("Icon", optional(file_path)),
+                   fps=fps,
+                   fixed_timestep=reader.get("FixedTimestep", boolean, False),
+                   tick_rate=reader.get("TickRate", positive_integer, fps),
+                   max_ticks_per_frame=reader.get("MaxTicksPerFrame", positive_integer, 5),
+                   interpolation=reader.get("Interpolation", boolean, False),
+                   pause_fps=reader.get("PauseFPS", positive_integer, 20),
+                   pause_wait_timeout=reader.get("PauseWaitTimeout", positive_integer, 500),
+                   profiler_frames=reader.get("ProfilerFrames", positive_integer, 600),
+                   profiler_dump=reader.get("ProfilerDump", optional(text), None),
+                   headless=reader.get("Headless", boolean, False),
+                   seed=reader.get("Seed", optional(non_negative_integer), None),
+                   settings_reload=reader.get("SettingsReload", boolean, False),
+                   settings_poll=reader.get("SettingsPoll", positive_number, 1.0),
+                   render_mode=reader.get("RenderMode", choice("full", "dirty"), "full"),
+                   collision_mode=reader.get("CollisionMode", choice("linear", "grid"), "linear"),
+                   monster_engine=reader.get("MonsterEngine", choice("python", "numpy"), "python"),
+                   spawn_per_round=reader.get("SpawnPerRound", positive_integer, 1),
+                   round_bonus=reader.get("RoundBonus", non_negative_integer, 10000),
+                   screen_size=reader.get("ScreenSize", size),
+                   font=FontSettings.read(reader),
+                   background=BackgroundSettings.read(reader),
+                   music_play=reader.get("Music.Play", optional(file_path)),
+                   music_pause=reader.get("Music.Pause", optional(file_path)),
+                   sound_next_level=reader.get("Sound.NextLevel", file_path))
+
+
+def load_settings(record_class, filename: str, logger: ColorLogger = None, overrides: dict = None, exit_on_error: bool = True):
+    """Load & validate a settings file into a record_class object (a tuple of them when the file contains a list)
+
+    overrides: top level fields replacing the ones of the file, each of them must be a field of record_class
+    Exit the program when the file can't be loaded or a field is invalid (raise SettingsError if not exit_on_error).
+    """
+    param_file = os.path.join(SETTINGS, filename)
+    parameters = ParameterFile(param_file, logger).parameters
+    try:
+        if not parameters:
+            raise SettingsError(f"{param_file} is empty or can't be loaded")
+        if overrides:
+            parameters.update(overrides)
+        if isinstance(parameters, list):
+            record = tuple(record_class.read(SettingsReader(item, f"{param_file} (item {i+1})"))
+                           for i, item in enumerate(parameters))
+        else:
+            reader = SettingsReader(parameters, param_file)
+            record = record_class.read(reader)
+            # A misspelt override would silently keep the value of the file
+            unknown = [field for field in overrides or () if field not in reader.read_fields]
+            if unknown:
+                raise SettingsError(f"{param_file}: unknown field(s) {', '.join(map(repr, unknown))} in overrides")
+    except SettingsError as e:
+        if not exit_on_error:
+            raise
+        if logger:
+            logger.error(str(e))
+            logger.error(f"EXIT PROGRAM !!!")
+        else:
+            print("ERROR:", str(e))
+            print("ERROR:", f"EXIT PROGRAM !!!")
+        exit()
+    if logger and logger.isEnabledFor(logging.INFO):
+        logger.info(f"Settings loaded from {filename}: {record}")
+    return record
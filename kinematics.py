@@ -0,0 +1,99 @@
+# Standard Python Modules
+
+# External Python Modules
+import pygame
+try:
+    import numpy as np      # Optional, only needed by MonsterKinematics
+except ImportError:
+    np = None
+
+# Personal Python Modules
+from const import *
+from utils.coloredlog import ColorLogger
+
+
+class MonsterKinematics():
+    """Move & bounce all monsters at once, using NumPy arrays (one array per monster attribute)
+
+    Monsters are gamecore.MonsterState objects (not imported: the game core imports this module).
+    Monsters motion attributes (dx, dy, velocity) are only read when monsters are loaded:
+    while the engine runs, positions are stored in arrays and copied to the monster rects by sync_rects().
+    """
+
+    def __init__(self, play_zone: pygame.Rect, keep_previous: bool = False, logger: ColorLogger = None):
+        """keep_previous: keep positions before the last update, to interpolate rects between 2 steps"""
+        if np is None:
+            raise ImportError("NumPy is required by MonsterKinematics")
+        self.logger = logger
+        self.play_zone = play_zone
+        self.keep_previous = keep_previous
+        self.load([])
+
+    def __len__(self):
+        return len(self.monsters)
+
+    def load(self, monsters: list):
+        """Replace the monsters handled by the engine"""
+        self.monsters: list["MonsterState"] = list(monsters)
+        self.slots = {monster: slot for slot, monster in enumerate(self.monsters)}
+        self.x = np.array([monster.rect.x for monster in self.monsters], dtype=np.int32)
+        self.y = np.array([monster.rect.y for monster in self.monsters], dtype=np.int32)
+        self.width = np.array([monster.rect.width for monster in self.monsters], dtype=np.int32)
+        self.height = np.array([monster.rect.height for monster in self.monsters], dtype=np.int32)
+        self.dx = np.array([monster.dx for monster in self.monsters], dtype=np.int32)
+        self.dy = np.array([monster.dy for monster in self.monsters], dtype=np.int32)
+        self.velocity = np.array([monster.velocity for monster in self.monsters], dtype=np.int32)
+        self.previous_x, self.previous_y = self.x.copy(), self.y.copy()
+
+    def remove(self, monster: "MonsterState"):
+        """Stop moving monster (its slot is replaced by the last monster)"""
+        slot = self.slots.pop(monster, None)
+        if slot is None:
+            return
+        last = len(self.monsters) - 1
+        if slot != last:
+            moved = self.monsters[last]
+            self.monsters[slot] = moved
+            self.slots[moved] = slot
+            for array in (self.x, self.y, self.width, self.height, self.dx, self.dy, self.velocity, self.previous_x, self.previous_y):
+                array[slot] = array[last]
+        self.monsters.pop()
+        self.x, self.y, self.width, self.height = self.x[:last], self.y[:last], self.width[:last], self.height[:last]
+        self.dx, self.dy, self.velocity = self.dx[:last], self.dy[:last], self.velocity[:last]
+        self.previous_x, self.previous_y = self.previous_x[:last], self.previous_y[:last]
+
+    def update(self):
+        """Same motion as MonsterState.update, for every monster"""
+        if self.keep_previous:
+            self.previous_x[:] = self.x
+            self.previous_y[:] = self.y
+        self.x += self.dx * self.velocity
+        self.y += self.dy * self.velocity
+
+        # Bounce the monsters off the edges of the play zone
+        zone = self.play_zone
+        self.dx[(self.x <= zone.left) | (self.x + self.width >= zone.right)] *= -1
+        self.dy[(self.y <= zone.top) | (self.y + self.height >= zone.bottom)] *= -1
+
+    def collide_any(self, rect: pygame.Rect) -> "MonsterState":
+        """Return the first monster colliding with rect (None if no collision)"""
+        hits = np.flatnonzero((self.x < rect.right) & (self.x + self.width > rect.left) &
+                              (self.y < rect.bottom) & (self.y + self.height > rect.top))
+        return self.monsters[hits[0]] if hits.size else None
+
+    def sync_rects(self, alpha: float = None):
+        """Copy positions to the monster rects (needed before drawing)
+
+        alpha: when specified, rects are placed between previous & current positions (0: previous, 1: current)
+        """
+        x, y = self.x, self.y
+        if alpha is not None and self.keep_previous:
+            x = np.rint(self.previous_x + (self.x - self.previous_x) * alpha).astype(np.int32)
+            y = np.rint(self.previous_y + (self.y - self.previous_y) * alpha).astype(np.int32)
+        for monster, x, y in zip(self.monsters, x.tolist(), y.tolist()):
+            monster.rect.topleft = (x, y)
+
+    def sync_motion(self):
+        """Copy motions (dx, dy) back to the monsters, so they keep their direction when loaded again"""
+        for monster, dx, dy in zip(self.monsters, self.dx.tolist(), self.dy.tolist()):
+            monster.dx, monster.dy = dx, dy
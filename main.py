@@ -4,8 +4,11 @@ __appname__ = 'Monsters'
 __version__ = 'V 1.0.0'
 
 # Standard Python Modules
+import argparse
+import cProfile
 import logging
 import os
+import pstats
 from pathlib import Path
 from typing import Any
 
@@ -14,9 +17,11 @@ import pygame
 
 # Personal Python Modules
 from const import *
+from autopilot import Autopilot
 from game import Game
 from utils.coloredlog import ColorLogger, get_logger, LOGLEVEL_SUCCESS, LOGLEVEL_DISABLE
 from utils.filename import FileName
+from utils.sampler import SamplingProfiler
 
 ### Global Variables
 ### uncomment lines below if you want a dynamic log name instead
@@ -28,19 +33,83 @@ if LOG_FILE == "DYNAMIC":
     logfilename_object.add_datetime()
     LOG_FILE = logfilename_object.fullpath
 
+def get_arguments() -> argparse.Namespace:
+    """ Parse command line arguments. """
+    parser = argparse.ArgumentParser(prog=__appname__, description="Catch the monsters of the requested color")
+    parser.add_argument("--headless", action=argparse.BooleanOptionalAction, default=None,
+                        help="run without window nor sound card, as fast as possible (default: value from game.yaml)")
+    parser.add_argument("--frames", type=int, default=None, metavar="N",
+                        help="stop the game after N frames")
+    parser.add_argument("--seconds", type=float, default=None, metavar="N",
+                        help="stop the game after N seconds")
+    parser.add_argument("--rounds", type=int, default=None, metavar="N",
+                        help="stop the game after N rounds")
+    parser.add_argument("--autopilot", action="store_true",
+                        help="let a bot play (soak tests: combine with --rounds or --seconds, --headless & --profile-dump)")
+    parser.add_argument("--seed", type=int, default=None, metavar="N",
+                        help="random seed of the game (default: value from game.yaml, a new one if null)")
+    parser.add_argument("--record", default=None, metavar="FILE",
+                        help="save the seed & the inputs of the game in a replay file")
+    parser.add_argument("--replay", default=None, metavar="FILE",
+                        help="play again a recorded game: in real time, or as fast as possible with --headless")
+    parser.add_argument("--profile", choices=["cprofile", "sampling"], default=None,
+                        help="run the game under cProfile or the built-in sampling profiler, result is saved in the logs directory")
+    parser.add_argument("--profile-dump", default=None, metavar="FILE",
+                        help="save the frame profiler timings (.csv or .json) when the game ends")
+    return parser.parse_args()
+
 def init():
     """ Clear Screen, display banner & start the logger. """
     CONSOLE.clear_screen()
     global logger
-    logger = get_logger(logger_name=__appname__, console_loglevel=LOGLEVEL_CONSOLE, file_loglevel=LOGLEVEL_FILE, logfile=LOG_FILE, success_level=LOGLEVEL_SUCCESS)
+    logger = get_logger(logger_name=__appname__, console_loglevel=LOGLEVEL_CONSOLE, file_loglevel=LOGLEVEL_FILE, logfile=LOG_FILE, success_level=LOGLEVEL_SUCCESS,
+                        queue=LOG_QUEUE, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT)
     logger.info(f"Application Start")
     logger.info(f"Logging levels : Console={LOGLEVEL_CONSOLE}; File={LOGLEVEL_FILE}; Logfile='{LOG_FILE}'")
     logger.debug("Confirm Debug Mode is Activated")
     # logger.log(LOGLEVEL_SUCCESS, 'Then success level that is a custom level')
 
-if __name__ == "__main__":
-    init()
-    game = Game(logger)
+def get_profile_filename(extension: str) -> str:
+    """ Return a file name in the logs directory, timestamped like the dynamic log file. """
+    os.makedirs(LOG_DIR, exist_ok=True)
+    profile_filename_object = FileName(os.path.join(LOG_DIR, __appname__ + extension))
+    profile_filename_object.add_datetime()
+    return profile_filename_object.fullpath
+
+def play(args: argparse.Namespace):
+    """ Create the game & play until the user quits or a limit given on command line is reached. """
+    settings_overrides = {}
+    if args.profile_dump:
+        settings_overrides["ProfilerDump"] = args.profile_dump
+    if args.seed is not None:
+        settings_overrides["Seed"] = args.seed
+    controls = Autopilot(logger=logger) if args.autopilot else None
+    game = Game(logger, headless=args.headless, settings_overrides=settings_overrides, controls=controls,
+                record_file=args.record, replay_file=args.replay)
     game.pause_game(msg=game.title, enter_to_text="start")
     game.start_new_round()
-    game.main_game_loop()
\ No newline at end of file
+    game.main_game_loop(max_frames=args.frames, max_seconds=args.seconds, max_rounds=args.rounds)
+
+if __name__ == "__main__":
+    args = get_arguments()
+    init()
+    if args.profile == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.runcall(play, args)
+        profile_file = get_profile_filename(".prof")
+        profiler.dump_stats(profile_file)
+        with open(os.path.splitext(profile_file)[0] + ".txt", "w") as report_file:
+            pstats.Stats(profiler, stream=report_file).sort_stats("cumulative").print_stats(50)
+        logger.info(f"cProfile result saved to '{profile_file}'")
+    elif args.profile == "sampling":
+        profiler = SamplingProfiler()
+        profiler.start()
+        try:
+            play(args)
+        finally:
+            profiler.stop()
+        profile_file = get_profile_filename(".folded")
+        profiler.dump(profile_file)
+        logger.info(f"Sampling profile ({profiler.samples} samples) saved to '{profile_file}'")
+    else:
+        play(args)
\ No newline at end of file
@@ -7,7 +7,8 @@ import pygame
 
 # Personal Python Modules
 from const import *
-from utils.parameterfile import ParameterFile
+from gamecore import zones_layout
+from gamesettings import ZoneSettings, load_settings
 from utils.coloredlog import ColorLogger
 
 
@@ -16,61 +17,50 @@ class SafeZone():
         self.logger = logger
         self.screen = screen
 
-        # load Dashboard settings
-        self.param_file = os.path.join(SETTINGS, "safezone.yaml")
-        self.settings = ParameterFile(self.param_file, logger).parameters
-        if self.logger:
-            self.logger.info(f"SafeZone settings: {self.settings}")
-        self._init_var_from_settings()
+        # load SafeZone settings
+        self.screen_rect = pygame.Rect(0, 0, 0, 0)
+        self.font: pygame.font.Font = None
+        self.apply_settings(load_settings(ZoneSettings, "safezone.yaml", logger))
+
+    def apply_settings(self, settings: ZoneSettings):
+        """Use settings, screen_rect is updated in place as other objects keep a reference to it"""
+        previous_font = self.settings.font if self.font else None
+        self.settings = settings
+        self.zone_height = settings.height
+        self.font_color = settings.font.color
+        self.background_color = settings.background.color
+        self.background_image_path = settings.background.image
 
         # Determine Rectangle for Safe zone at BOTTOM of screen
-        self.screen_rect = pygame.Rect(0, screen.get_height(
-        )-self.zone_height+1, screen.get_width(), self.zone_height)
+        self.screen_rect.update(zones_layout(self.screen.get_size(), 0, self.zone_height)[2])
 
         # Set background images
         if self.background_image_path:
-            self.background_image = pygame.transform.scale(
-                pygame.image.load(self.background_image_path), self.screen_rect.size)
+            self.background_image = ASSETS.get_image(
+                self.background_image_path, self.screen_rect.size, convert="opaque")
 
         # Set font
-        self.font = pygame.font.Font(self.font_path, size=self.font_size)
-
-    def _init_var_from_settings(self):
-        """ Initialize instance variables from setting file content """
-        try:
-            self.zone_height: str = self.settings["Height"]
-            self.font_path: str = self.settings["Font"]["Path"]
-            self.font_size: int = self.settings["Font"]["Size"]
-            self.font_color: tuple = self.settings["Font"]["Color"]
-            self.background_color: tuple = self.settings["Background"]["Color"]
-            self.background_image_path: str = self.settings["Background"]["Image"]
-        except Exception as e:
-            if self.logger:
-                self.logger.error(
-                    f"{str(e)} field not found in {self.param_file} !")
-                self.logger.error(f"EXIT PROGRAM !!!")
-            else:
-                print(
-                    "ERROR:", f"{str(e)} field not found in {self.param_file} !")
-                print("ERROR:", f"EXIT PROGRAM !!!")
-            exit()
+        if settings.font != previous_font:
+            self.font = pygame.font.Font(settings.font.path, size=settings.font.size)
 
-    def draw(self):
-        """Draw the Safezone"""
+    def draw(self, surface: pygame.Surface = None):
+        """Draw the Safezone on surface (default to the screen)"""
+        if surface is None:
+            surface = self.screen
         text_margin = 10
-        safezone_text = self.font.render(
-            "Safe Zone (press space to come here)", True, self.font_color)
+        safezone_text = TEXTS.render(
+            self.font, "Safe Zone (press space to come here)", self.font_color)
         safezone_rect = safezone_text.get_rect()
         safezone_rect.centerx = self.screen_rect.centerx
         safezone_rect.top = self.screen_rect.top + text_margin
 
         # Blit the safe zone
         if self.background_color:
-            pygame.draw.rect(self.screen, self.background_color,
+            pygame.draw.rect(surface, self.background_color,
                              self.screen_rect, 0)
         if self.background_image_path:
-            self.screen.blit(self.background_image, self.screen_rect)
-        self.screen.blit(safezone_text, safezone_rect)
+            surface.blit(self.background_image, self.screen_rect)
+        surface.blit(safezone_text, safezone_rect)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,110 @@
+### Import standard modules
+import os
+import threading
+
+### Import external modules
+import pygame
+
+### Import personal modules
+from utils.coloredlog import ColorLogger
+
+### Keep every decoded image (per size & pixel format) & sound in memory so it is only read once per process
+class AssetCache():
+    def __init__(self, logger:ColorLogger=None):
+        self.logger = logger
+        self.images = {}
+        self.sounds = {}
+        self.lock = threading.RLock()     # Assets may be loaded from a worker thread
+        self.hits = 0
+        self.misses = 0
+        self.converted = 0          # Number of surfaces converted to display pixel format
+        self.converted_bytes = 0
+
+    def get_image(self, path:str, size:tuple=None, convert:str=None) -> pygame.Surface:
+        """Return the image found at path, optionally scaled to size.
+
+        Surfaces are shared by every caller asking for the same (path, size, convert) key,
+        so they must be treated as read-only.
+
+        Args:
+            path (str): Image file path
+            size (tuple, optional): Size (width, height) to scale the image to. Defaults to None (original size).
+            convert (str, optional): Pixel format conversion mode. Defaults to None (no conversion).
+                - "alpha": display format with per-pixel alpha, for sprites
+                - "opaque": display format without alpha, fast path for backgrounds
+                Conversion needs the display mode to be set, it is skipped otherwise.
+
+        Returns:
+            pygame.Surface: the cached surface
+        """
+        with self.lock:
+            key = (path, tuple(size) if size else None, convert)
+            image = self.images.get(key)
+            if image is not None:
+                self.hits += 1
+                return image
+
+            self.misses += 1
+            image = pygame.image.load(path)
+            if self.logger:
+                self.logger.debug(f"Image '{path}' loaded from disk")
+            if size:
+                # Only the scaled variant is converted & kept, not the full size original
+                image = pygame.transform.scale(image, key[1])
+            if convert:
+                image = self._convert(image, convert, path)
+            self.images[key] = image
+            return image
+
+    def _convert(self, image:pygame.Surface, convert:str, path:str) -> pygame.Surface:
+        """Convert image to the display pixel format"""
+        if not pygame.display.get_surface():
+            if self.logger:
+                self.logger.warning(f"Image '{path}' not converted: display mode is not set")
+        elif convert in ("alpha", "opaque"):
+            image = image.convert_alpha() if convert == "alpha" else image.convert()
+            self.converted += 1
+            self.converted_bytes += image.get_pitch() * image.get_height()
+        elif self.logger:
+            self.logger.warning(f"Unknown convert mode '{convert}' for image '{path}'")
+        return image
+
+    def get_sound(self, path:str) -> pygame.mixer.Sound:
+        """Return the sound found at path, decoded once and shared by every caller"""
+        with self.lock:
+            sound = self.sounds.get(path)
+            if sound is not None:
+                self.hits += 1
+                return sound
+
+            self.misses += 1
+            sound = pygame.mixer.Sound(file=path)
+            if self.logger:
+                self.logger.debug(f"Sound '{path}' loaded from disk")
+            self.sounds[path] = sound
+            return sound
+
+    def stats(self) -> dict:
+        """Return the cache counters"""
+        return {
+            "images": len(self.images),
+            "sounds": len(self.sounds),
+            "hits": self.hits,
+            "misses": self.misses,
+            "converted": self.converted,
+            "converted_bytes": self.converted_bytes
+        }
+
+    def clear(self):
+        """Drop every cached asset (counters are kept)"""
+        self.images.clear()
+        self.sounds.clear()
+
+if __name__ == "__main__":
+    CUR_DIR=os.path.dirname(os.path.abspath(__file__))
+    image_path = os.path.join(CUR_DIR,"../assets/images/player/knight.png")
+    pygame.init()
+    cache = AssetCache()
+    for i in range(10):
+        cache.get_image(image_path, (64, 64))
+    print(cache.stats())
@@ -8,11 +8,17 @@ Description:
     - colored console logging
     - Logging to file
     - Possibility to log on both conosle & file but using different formatter for console and log file
+    - Non-blocking logging: records queued & written by a background thread, log file buffered & rotated by size
 '''
+import atexit
 import colorama as c
 import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 from pathlib import Path
 
 LOGLEVEL_SUCCESS = 15
@@ -48,6 +54,90 @@ class ColorFormatter(logging.Formatter):
             record.msg = record.msg  + self.color_reset 
         return logging.Formatter.format(self, record)
 
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Log file only written to disk when flushed (or rotated/closed), rotated when it reaches max_bytes (0: never)"""
+    def __init__(self, filename:Path, max_bytes:int=0, backup_count:int=3, encoding:str="utf-8"):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.size = os.path.getsize(self.baseFilename) if os.path.isfile(self.baseFilename) else 0
+
+    def shouldRollover(self, record) -> bool:
+        # Size is counted while writing: checking the file position would flush the buffer at each record
+        return self.maxBytes > 0 and self.size >= self.maxBytes
+
+    def doRollover(self):
+        super().doRollover()
+        self.size = 0
+
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            self.stream.write(msg)
+            # max_bytes is a size on disk: count the encoded bytes, not the characters
+            self.size += len(msg.encode(self.encoding or "utf-8"))
+        except Exception:
+            self.handleError(record)
+
+class LogWriter():
+    """Background thread handling the records of a queue, so logging never blocks the caller on I/O
+
+    Records are handled by batches (everything waiting in the queue), handlers are flushed every flush_interval
+    seconds or as soon as an error is logged.
+    """
+    def __init__(self, handlers:list, flush_interval:float=0.5):
+        self.handlers = handlers
+        self.flush_interval = flush_interval
+        self.queue = queue.SimpleQueue()    # Unbounded: putting a record never waits
+        self._thread = threading.Thread(target=self._run, name="logwriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def _run(self):
+        last_flush = time.perf_counter()
+        running = True
+        while running:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                batch = []
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            urgent = False
+            for record in batch:
+                if record is None:
+                    running = False
+                    continue
+                urgent = urgent or record.levelno >= logging.ERROR
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            now = time.perf_counter()
+            if urgent or not running or now - last_flush >= self.flush_interval:
+                for handler in self.handlers:
+                    handler.flush()
+                last_flush = now
+
+    def stop(self):
+        """Write the records still in the queue & stop the thread"""
+        if self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join()
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """Put records in the LogWriter queue with as little work as possible on the calling thread"""
+    def prepare(self, record):
+        # Arguments are merged now as they may change before the record is written, formatting is left to the writer.
+        # The record is not copied nor stripped: it stays in the process & this handler is the only one of the logger.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
 class ColorLoggerOptions():
     def __init__(self, 
                 console:bool=True, 
@@ -55,14 +145,23 @@ class ColorLoggerOptions():
                 console_logging_level = logging.WARNING,
                 logfile_name:Path = "",
                 logfile_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
-                logfile_logging_level = logging.DEBUG
+                logfile_logging_level = logging.DEBUG,
+                logfile_max_bytes:int = 0,
+                logfile_backup_count:int = 3,
+                queue:bool = False,
+                flush_interval:float = 0.5
                 ):
+        """queue: log records are written by a background thread (LogWriter) instead of the calling thread"""
         self.console = console
         self.console_formatter = console_formatter
         self.console_logging_level = console_logging_level
         self.logfile_name = logfile_name
         self.logfile_formatter = logfile_formatter
         self.logfile_logging_level = logfile_logging_level
+        self.logfile_max_bytes = logfile_max_bytes
+        self.logfile_backup_count = logfile_backup_count
+        self.queue = queue
+        self.flush_interval = flush_interval
     
     def to_json(self, indent:int=None):
         result = {
@@ -73,14 +172,20 @@ class ColorLoggerOptions():
             "logfile_name": str(self.logfile_name),
             # "logfile_formatter": "logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')",
             "logfile_formatter": get_formatter_definition(self.logfile_formatter),
-            "logfile_logging_level": self.logfile_logging_level
+            "logfile_logging_level": self.logfile_logging_level,
+            "logfile_max_bytes": self.logfile_max_bytes,
+            "logfile_backup_count": self.logfile_backup_count,
+            "queue": self.queue,
+            "flush_interval": self.flush_interval
         }
         return json.dumps(result, indent=indent)
 
 class ColorLogger(logging.getLoggerClass()):
     def __init__(self, name:str="default", options=ColorLoggerOptions()):
         logging.Logger.__init__(self, name, logging.DEBUG)
-        
+        handlers = []
+        self.writer:LogWriter = None
+
         # Will log to a logfile
         if options.logfile_name:
             path = os.path.dirname(os.path.abspath(options.logfile_name))
@@ -94,19 +199,47 @@ class ColorLogger(logging.getLoggerClass()):
                 else:
                     print(f"Logging directory created '{path}'")
             if os.path.exists(path): 
-                fh = logging.FileHandler(options.logfile_name, encoding='utf-8')
+                if options.queue:
+                    fh = BufferedRotatingFileHandler(options.logfile_name, max_bytes=options.logfile_max_bytes,
+                                                     backup_count=options.logfile_backup_count)
+                elif options.logfile_max_bytes:
+                    fh = logging.handlers.RotatingFileHandler(options.logfile_name, maxBytes=options.logfile_max_bytes,
+                                                              backupCount=options.logfile_backup_count, encoding='utf-8')
+                else:
+                    fh = logging.FileHandler(options.logfile_name, encoding='utf-8')
                 fh.setLevel(options.logfile_logging_level)
                 fh.setFormatter(options.logfile_formatter)
-                self.addHandler(fh)
+                handlers.append(fh)
 
         # Put the console handler as last otherwise message is modified with color and appear as well in the file
         if options.console:
             ch = logging.StreamHandler()
             ch.setLevel(options.console_logging_level)
             ch.setFormatter(options.console_formatter)
-            self.addHandler(ch)
+            handlers.append(ch)
+
+        if options.queue and handlers:
+            self.writer = LogWriter(handlers, flush_interval=options.flush_interval)
+            self.addHandler(LogQueueHandler(self.writer.queue))
+        else:
+            for handler in handlers:
+                self.addHandler(handler)
+
+        # Messages below every handler level are dropped before being formatted
+        self.setLevel(min([handler.level for handler in handlers], default=LOGLEVEL_DISABLE))
+
+    def close(self):
+        """Write pending records (queue mode) & close the handlers"""
+        if self.writer:
+            self.writer.stop()
+            handlers = self.writer.handlers
+        else:
+            handlers = self.handlers
+        for handler in handlers:
+            handler.close()
 
-def get_logger(logger_name:str=None, console_loglevel:int=LOGLEVEL_SUCCESS, file_loglevel:int=LOGLEVEL_DISABLE, logfile:Path=None, success_level=LOGLEVEL_SUCCESS) -> ColorLogger:
+def get_logger(logger_name:str=None, console_loglevel:int=LOGLEVEL_SUCCESS, file_loglevel:int=LOGLEVEL_DISABLE, logfile:Path=None, success_level=LOGLEVEL_SUCCESS,
+               queue:bool=False, max_bytes:int=0, backup_count:int=3) -> ColorLogger:
     if not logger_name:
         logger_name, _ = os.path.splitext(os.path.basename(__file__))
     if (not logfile or logfile == "None") and file_loglevel != LOGLEVEL_DISABLE:
@@ -115,7 +248,8 @@ def get_logger(logger_name:str=None, console_loglevel:int=LOGLEVEL_SUCCESS, file
     #     file_loglevel = logging.DEBUG
     if logfile and file_loglevel == LOGLEVEL_DISABLE:
         logfile = None
-    log_options = ColorLoggerOptions(logfile_name=logfile, console_logging_level=console_loglevel, logfile_logging_level=file_loglevel)
+    log_options = ColorLoggerOptions(logfile_name=logfile, console_logging_level=console_loglevel, logfile_logging_level=file_loglevel,
+                                     logfile_max_bytes=max_bytes, logfile_backup_count=backup_count, queue=queue)
     logger = ColorLogger(name=logger_name, options=log_options)
     # save_logger_options(log_options)
     return logger
@@ -0,0 +1,101 @@
+### Import standard modules
+import csv
+import json
+import time
+from collections import deque
+
+### Import external modules
+import pygame
+
+### Import personal modules
+
+### Time the phases (zones) of each frame & keep the last frames in a ring buffer
+class FrameProfiler():
+    def __init__(self, max_frames:int=600):
+        self.frames = deque(maxlen=max_frames)      # Ring buffer of {zone: duration in ms}, oldest frames are dropped
+        self.zones = {}
+        self.frame_start = self.last_mark = time.perf_counter()
+
+    def begin_frame(self):
+        self.zones = {}
+        self.frame_start = self.last_mark = time.perf_counter()
+
+    def mark(self, zone:str):
+        """Record the time spent since previous mark (or frame start) in zone"""
+        now = time.perf_counter()
+        self.zones[zone] = self.zones.get(zone, 0.0) + (now - self.last_mark) * 1000
+        self.last_mark = now
+
+    def skip(self):
+        """Don't record the time spent since previous mark (neither in a zone nor in the frame duration)"""
+        now = time.perf_counter()
+        self.frame_start += now - self.last_mark
+        self.last_mark = now
+
+    def end_frame(self, sprites:int=0, draw_calls:int=0):
+        """Close the frame, with its counters: sprites drawn & draw calls made to the screen"""
+        self.zones["frame"] = (time.perf_counter() - self.frame_start) * 1000
+        self.zones["sprites"] = sprites
+        self.zones["draw_calls"] = draw_calls
+        self.frames.append(self.zones)
+
+    def zone_names(self) -> list:
+        names = {}
+        for frame in self.frames:
+            names.update(dict.fromkeys(frame))
+        return list(names)
+
+    def averages(self, last:int=60) -> dict:
+        """Return the average duration (ms) of each zone over the last frames"""
+        frames = list(self.frames)[-last:]
+        if not frames:
+            return {}
+        return {zone: sum(frame.get(zone, 0.0) for frame in frames) / len(frames) for zone in self.zone_names()}
+
+    def histogram(self, bins:list) -> list:
+        """Return the number of frames whose duration (ms) is below each bin upper bound (last bin counts the rest)"""
+        counts = [0] * (len(bins) + 1)
+        for frame in self.frames:
+            i = 0
+            while i < len(bins) and frame["frame"] >= bins[i]:
+                i += 1
+            counts[i] += 1
+        return counts
+
+    def render_overlay(self, font:pygame.font.Font, fps:float, color:tuple=(255, 255, 255)) -> pygame.Surface:
+        """Return a surface showing FPS, frame time histogram, zones breakdown, sprite & draw call counts"""
+        averages = self.averages()
+        lines = [f"FPS: {fps:.1f}   sprites: {int(averages.get('sprites', 0))}   draw calls: {averages.get('draw_calls', 0):.1f}"]
+        lines += [f"{zone}: {duration:.2f} ms" for zone, duration in averages.items() if zone not in ("sprites", "draw_calls")]
+        bins = [4, 8, 12, 16.7, 25, 33.3]
+        counts = self.histogram(bins)
+        labels = [f"<{upper}" for upper in bins] + [f">={bins[-1]}"]
+
+        line_height = font.get_linesize()
+        bar_max = 150
+        width = 300
+        height = line_height * (len(lines) + len(labels) + 1)
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+        y = 0
+        for line in lines:
+            overlay.blit(font.render(line, True, color), (5, y))
+            y += line_height
+        y += line_height // 2
+        total = max(1, sum(counts))
+        for label, count in zip(labels, counts):
+            overlay.blit(font.render(f"{label} ms", True, color), (5, y))
+            pygame.draw.rect(overlay, color, (95, y + 2, int(bar_max * count / total), line_height - 4))
+            y += line_height
+        return overlay
+
+    def dump(self, filename:str):
+        """Write the ring buffer content to a CSV or JSON file (depending on filename extension)"""
+        if filename.lower().endswith(".json"):
+            with open(filename, "w") as dump_file:
+                json.dump(list(self.frames), dump_file, indent=1)
+        else:
+            with open(filename, "w", newline="") as dump_file:
+                writer = csv.DictWriter(dump_file, fieldnames=self.zone_names(), restval=0.0)
+                writer.writeheader()
+                writer.writerows(self.frames)
@@ -1,9 +1,15 @@
 ### Import standard modules
 import json
+import os
+import time
 from pathlib import Path
 
 ### Import external modules
 import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader      # LibYAML based loader, much faster when available
+except ImportError:
+    from yaml import SafeLoader
 
 ### Import personal modules
 from utils.filename import FileName
@@ -11,8 +17,11 @@ from utils.coloredlog import ColorLogger, get_logger, LOGLEVEL_SUCCESS, LOGLEVEL
    
 ### Retrieve Json or Yaml Content
 class ParameterFile():
-    def __init__(self, filename:Path="", logger:ColorLogger=None):
+    def __init__(self, filename:Path="", logger:ColorLogger=None, use_cache:bool=True):
+        """use_cache: keep parsed parameters in a JSON cache file next to the parameter file ('.<name>.cache.json'),
+        used as long as the parameter file modification time & size don't change"""
         self.filename = FileName()
+        self.use_cache = use_cache
         self.parameters={}
         self.logger = ColorLogger()
         if logger is None:
@@ -39,21 +48,64 @@ class ParameterFile():
         if filetype not in supported_filetype:
             self.logger.error(f"Parameter file supports following format only: json, yml, yaml.")
         else:
+            start = time.perf_counter()
             try:
-                if filetype == ".json":
+                file_stat = os.stat(self.filename.fullpath)
+                cached = self.load_cache(file_stat) if self.use_cache else None
+                if cached is not None:
+                    self.parameters = cached
+                elif filetype == ".json":
                     with open(self.filename.fullpath) as config_file:
                         self.parameters = json.load(config_file)
                 elif filetype == ".yaml" or filetype == ".yml" :
                     with open(self.filename.fullpath) as config_file:
-                        self.parameters = yaml.safe_load(config_file)
+                        self.parameters = yaml.load(config_file, Loader=SafeLoader)
             except Exception as e:
                 self.logger.error(f"with Parameter File '{self.filename.fullpath}':")
                 self.logger.error(f"{str(e)}")
             else:
-                self.logger.log(LOGLEVEL_SUCCESS, f"Parameter file '{self.filename.fullpath}' successfuly loaded")
+                duration = (time.perf_counter() - start) * 1000
+                if cached is not None:
+                    self.logger.log(LOGLEVEL_SUCCESS, f"Parameter file '{self.filename.fullpath}' successfuly loaded (cache hit in {duration:.2f} ms)")
+                else:
+                    self.logger.log(LOGLEVEL_SUCCESS, f"Parameter file '{self.filename.fullpath}' successfuly loaded (parsed with {SafeLoader.__name__} in {duration:.2f} ms)")
+                    if self.use_cache:
+                        self.save_cache(file_stat)
 
         return self.parameters
 
+    def get_cache_filename(self) -> str:
+        return os.path.join(self.filename.filepath, "." + self.filename.filename + ".cache.json")
+
+    def load_cache(self, file_stat:os.stat_result):
+        """Return parameters from the cache file (None when there is no cache or it is outdated)"""
+        try:
+            # JSON, not pickle: a cache file must never be able to run code
+            with open(self.get_cache_filename()) as cache_file:
+                cache = json.load(cache_file)
+        except Exception:
+            return None
+        if not isinstance(cache, dict) or cache.get("mtime") != file_stat.st_mtime_ns or cache.get("size") != file_stat.st_size:
+            return None
+        return cache.get("parameters")
+
+    def save_cache(self, file_stat:os.stat_result):
+        """Save parameters in the cache file, with the modification time & size of the parameter file they were parsed from
+
+        Parameters JSON can't hold as they are (dates, non string keys...) are not cached.
+        """
+        cache = {"mtime": file_stat.st_mtime_ns, "size": file_stat.st_size, "parameters": self.parameters}
+        cache_filename = self.get_cache_filename()
+        try:
+            cache_json = json.dumps(cache)
+            if json.loads(cache_json)["parameters"] != self.parameters:
+                raise ValueError("parameters would not be the same once read from JSON")
+            with open(cache_filename + ".tmp", "w") as cache_file:
+                cache_file.write(cache_json)
+            os.replace(cache_filename + ".tmp", cache_filename)     # Never leave a half written cache
+        except Exception as e:
+            self.logger.debug(f"Unable to save parameter cache '{cache_filename}': {str(e)}")
+
 if __name__ == "__main__":
     import os
     CUR_DIR=os.path.dirname(os.path.abspath(__file__))
@@ -0,0 +1,55 @@
+### Import standard modules
+
+### Import external modules
+import pygame
+
+### Import personal modules
+
+### Collect the blits of a frame & submit them in a single Surface.blits call
+class RenderQueue():
+    def __init__(self):
+        self.layers = {}            # {layer: [(surface, dest) or (surface, dest, area)]}, drawn from the lowest layer
+        self.size = 0
+        self.draw_calls = 0         # Calls made to the target surface since the last new_frame()
+        self.blits = 0              # Surfaces drawn since the last new_frame()
+
+    def add(self, surface:pygame.Surface, dest, area:pygame.Rect=None, layer:int=0):
+        """Queue a blit of surface at dest (area: part of surface to draw, default all of it)"""
+        items = self.layers.get(layer)
+        if items is None:
+            items = self.layers[layer] = []
+        items.append((surface, dest) if area is None else (surface, dest, area))
+        self.size += 1
+
+    def extend(self, items:list, layer:int=0):
+        """Queue blits given as (surface, dest) or (surface, dest, area) tuples"""
+        queued = self.layers.get(layer)
+        if queued is None:
+            queued = self.layers[layer] = []
+        size = len(queued)
+        queued.extend(items)
+        self.size += len(queued) - size
+
+    def submit(self, target:pygame.Surface):
+        """Draw the queued blits on target, layer after layer (in the order they were queued within a layer), & empty the queue
+
+        Destination rects are read now: rects shared with sprites may be moved again once submitted.
+        """
+        if not self.size:
+            return
+        layers = self.layers
+        if len(layers) == 1:
+            sequence = next(iter(layers.values()))
+        else:
+            sequence = [item for layer in sorted(layers) for item in layers[layer]]
+        target.blits(sequence, doreturn=False)
+        self.draw_calls += 1
+        self.blits += self.size
+        self.layers = {}
+        self.size = 0
+
+    def new_frame(self) -> tuple:
+        """Return (draw calls, blits) since the previous frame & start counting for a new one"""
+        counts = (self.draw_calls, self.blits)
+        self.draw_calls = self.blits = 0
+        return counts
@@ -0,0 +1,64 @@
+### Import standard modules
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+### Import external modules
+
+### Import personal modules
+
+### Statistical profiler: a background thread periodically records the call stack of a thread
+class SamplingProfiler():
+    def __init__(self, interval:float=0.005, thread_id:int=None):
+        """Sample the stack of thread_id (default to the current thread) every interval seconds"""
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()         # "outer;...;inner" call stack: number of samples
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def dump(self, filename:str):
+        """Write samples in collapsed stacks format (one "stack count" per line, as used by flame graph tools)"""
+        with open(filename, "w") as dump_file:
+            for stack, count in self.stacks.most_common():
+                dump_file.write(f"{stack} {count}\n")
+
+if __name__ == "__main__":
+    def busy():
+        end = time.perf_counter() + 0.5
+        while time.perf_counter() < end:
+            sum(range(1000))
+
+    sampler = SamplingProfiler()
+    sampler.start()
+    busy()
+    sampler.stop()
+    print(f"{sampler.samples} samples")
+    for stack, count in sampler.stacks.most_common(3):
+        print(count, stack)
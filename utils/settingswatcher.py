@@ -0,0 +1,49 @@
+### Import standard modules
+import os
+import time
+
+### Import external modules
+
+### Import personal modules
+from utils.coloredlog import ColorLogger
+
+### Detect changed parameter files by polling their modification time (no OS specific notification API needed)
+class SettingsWatcher():
+    def __init__(self, directory:str, interval:float=1.0, extensions:tuple=(".yaml", ".yml", ".json"), logger:ColorLogger=None):
+        """Check the files of directory at most every interval seconds, hidden files (like parameter caches) are ignored"""
+        self.directory = directory
+        self.interval = interval
+        self.extensions = extensions
+        self.logger = logger
+        self.files = self.snapshot()        # file name: (modification time in ns, size)
+        self.last_poll = time.perf_counter()
+
+    def snapshot(self) -> dict:
+        files = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith(".") or not entry.name.lower().endswith(self.extensions):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue        # Removed while scanning
+                    files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            if self.logger:
+                self.logger.warning(f"Unable to watch settings directory '{self.directory}': {str(e)}")
+        return files
+
+    def poll(self) -> list:
+        """Return the names of the files created or modified since the previous check (empty list between 2 checks)"""
+        now = time.perf_counter()
+        if now - self.last_poll < self.interval:
+            return []
+        self.last_poll = now
+        files = self.snapshot()
+        changed = [name for name, stat in files.items() if self.files.get(name) != stat]
+        self.files = files
+        if changed and self.logger:
+            self.logger.info(f"Settings files changed: {', '.join(changed)}")
+        return changed
@@ -0,0 +1,66 @@
+### Import standard modules
+
+### Import external modules
+import pygame
+
+### Import personal modules
+
+### Uniform grid index of sprites, to only test collisions with sprites close to each other
+class SpatialHash():
+    def __init__(self, cell_size:int):
+        """Sprites are indexed in the cell of their top-left corner, so cell_size must be at least the size of the biggest sprite"""
+        self.cell_size = cell_size
+        self.cells = {}             # (column, row): {sprite: None}, dict keeps insertion order
+        self.sprite_cells = {}      # sprite: (column, row)
+
+    def __len__(self):
+        return len(self.sprite_cells)
+
+    def add(self, sprite:pygame.sprite.Sprite):
+        """Index sprite in the cell of its top-left corner"""
+        cell = (sprite.rect.x // self.cell_size, sprite.rect.y // self.cell_size)
+        self.sprite_cells[sprite] = cell
+        self.cells.setdefault(cell, {})[sprite] = None
+
+    def remove(self, sprite:pygame.sprite.Sprite):
+        """Remove sprite from the index"""
+        cell = self.sprite_cells.pop(sprite, None)
+        if cell is None:
+            return
+        sprites = self.cells[cell]
+        del sprites[sprite]
+        if not sprites:
+            del self.cells[cell]
+
+    def move(self, sprite:pygame.sprite.Sprite):
+        """Update the index after sprite moved, cells are only touched when the sprite crossed a cell border"""
+        rect = sprite.rect
+        cell = (rect.x // self.cell_size, rect.y // self.cell_size)
+        if cell != self.sprite_cells[sprite]:
+            self.remove(sprite)
+            self.sprite_cells[sprite] = cell
+            self.cells.setdefault(cell, {})[sprite] = None
+
+    def clear(self):
+        self.cells.clear()
+        self.sprite_cells.clear()
+
+    def query(self, rect:pygame.Rect) -> list:
+        """Return sprites indexed in the cells neighbouring rect (candidates, rects may not collide)"""
+        size = self.cell_size
+        # A sprite overlapping rect has its top-left corner at most one cell before rect top-left corner
+        candidates = []
+        for column in range((rect.left - size) // size, (rect.right - 1) // size + 1):
+            for row in range((rect.top - size) // size, (rect.bottom - 1) // size + 1):
+                sprites = self.cells.get((column, row))
+                if sprites:
+                    candidates.extend(sprites)
+        return candidates
+
+    def collide_any(self, sprite:pygame.sprite.Sprite) -> pygame.sprite.Sprite:
+        """Same as pygame.sprite.spritecollideany but only testing sprites in the neighbouring cells"""
+        colliderect = sprite.rect.colliderect
+        for candidate in self.query(sprite.rect):
+            if colliderect(candidate.rect):
+                return candidate
+        return None
@@ -0,0 +1,76 @@
+### Import standard modules
+from collections import OrderedDict
+
+### Import external modules
+import pygame
+
+### Import personal modules
+
+### Keep the most recently rendered texts so a string is only rasterised once
+class TextCache():
+    def __init__(self, maxsize:int=256):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key) -> pygame.Surface:
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def _put(self, key, surface:pygame.Surface):
+        self.misses += 1
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)       # Evict the least recently used text
+
+    def render(self, font:pygame.font.Font, text:str, color:tuple, antialias:bool=True) -> pygame.Surface:
+        """Return text rendered with font, only rasterised when not found in cache.
+
+        Surfaces are shared by every caller asking for the same text, so they must be treated as read-only.
+        """
+        key = (font, text, tuple(color), antialias)
+        surface = self._get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            self._put(key, surface)
+        return surface
+
+    def render_number(self, font:pygame.font.Font, label:str, value:int, color:tuple, antialias:bool=True) -> pygame.Surface:
+        """Return label followed by value, the digits being composed from cached glyphs instead of rasterising the whole text"""
+        text = label + str(value)
+        key = (font, text, tuple(color), antialias)
+        surface = self._get(key)
+        if surface is None:
+            parts = [self.render(font, label, color, antialias)] if label else []
+            parts += [self.render(font, digit, color, antialias) for digit in str(value)]
+            surface = pygame.Surface((sum(part.get_width() for part in parts), max(part.get_height() for part in parts)),
+                                     pygame.SRCALPHA)
+            x = 0
+            for part in parts:
+                surface.blit(part, (x, 0))
+                x += part.get_width()
+            self._put(key, surface)
+        return surface
+
+    def stats(self) -> dict:
+        """Return the cache counters"""
+        return {"texts": len(self.surfaces), "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        """Drop every cached text (counters are kept)"""
+        self.surfaces.clear()
+
+if __name__ == "__main__":
+    import os
+    CUR_DIR=os.path.dirname(os.path.abspath(__file__))
+    pygame.init()
+    font = pygame.font.Font(os.path.join(CUR_DIR,"../assets/fonts/Pixel.ttf"), size=24)
+    cache = TextCache()
+    for score in range(0, 1000, 100):
+        cache.render(font, "Current Catch", (255, 0, 0))
+        cache.render_number(font, "Score: ", score, (255, 0, 0))
+    print(cache.stats())